@@ -0,0 +1,77 @@
+"""Load shedding for flash sales: a cap on concurrent heavy work, and click rate limits.
+
+``AdmissionController`` lets at most ``slots`` heavy reruns (checkout
+writes, admin dashboard loads) run at once across the process.  Others
+wait up to ``max_wait`` seconds in a queue of at most ``max_waiting``;
+beyond that they are turned away with ``Busy`` straight away, so a spike
+costs the rejected sessions a short message instead of slowing everyone.
+
+``TokenBucket`` is kept per session and limits how fast one shopper's
+clicks are acted on.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Busy(Exception):
+    """No slot became free in time; the caller should ask the user to retry."""
+
+
+class AdmissionController:
+    def __init__(self, slots=4, max_wait=2.0, max_waiting=32):
+        self.slots = slots
+        self.max_wait = max_wait
+        self.max_waiting = max_waiting
+        self._cond = threading.Condition()
+        self._running = 0
+        self._waiting = 0
+
+    @contextmanager
+    def slot(self):
+        """Hold one of the heavy-work slots for the duration of the block."""
+        with self._cond:
+            if self._running >= self.slots:
+                if self._waiting >= self.max_waiting:
+                    raise Busy()
+                self._waiting += 1
+                try:
+                    deadline = time.monotonic() + self.max_wait
+                    while self._running >= self.slots:
+                        left = deadline - time.monotonic()
+                        if left <= 0:
+                            raise Busy()
+                        self._cond.wait(left)
+                finally:
+                    self._waiting -= 1
+            self._running += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._cond.notify()
+
+    def load(self):
+        """``(running, waiting)``, for the admin's performance panel."""
+        with self._cond:
+            return self._running, self._waiting
+
+
+class TokenBucket:
+    """``burst`` actions at once, refilled at ``rate`` per second."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
@@ -0,0 +1,293 @@
+import mimetypes
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+import core
+import downloads
+import order_archive
+import order_export
+import perf
+import reconcile
+import sales_charts
+import screenshots
+from order_store import OrderFilters
+
+orders_db = core.get_order_store()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def count_orders(filters, latest_id):
+    # latest_id is only part of the cache key: a new order invalidates the count
+    return orders_db.count_orders(filters)
+
+
+@st.cache_data(show_spinner=False, max_entries=500)
+def screenshot_thumbnail(path, mtime):
+    # mtime keys the cache so a replaced file gets a fresh thumbnail
+    return screenshots.thumbnail(path)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def sales_chart_pngs(latest_id):
+    # Redrawn only when an order has been added since the last render
+    return sales_charts.render(orders_db.sales_summary())
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def search_archive(period, filters, mtime):
+    # mtime keys the cache: rerunning the archive job into a period refreshes it
+    return order_archive.search_archive(period, filters)
+
+
+@st.fragment(run_every=1)
+def receipt_progress(jobs):
+    # Polls only while a receipt is still rendering; the full rerun at the
+    # end replaces it with receipt_summary, which does not poll
+    finished = sum(job.done() for job in jobs.values())
+    if finished == len(jobs):
+        st.rerun()
+    st.progress(finished / len(jobs), text=f"{finished} of {len(jobs)} receipts done")
+
+
+def receipt_summary(jobs):
+    failed = {order_id: job.exception() for order_id, job in jobs.items() if job.exception()}
+    done = [(order_id, job.result()) for order_id, job in jobs.items() if order_id not in failed]
+    st.progress(1.0, text=f"{len(done)} of {len(jobs)} receipts ready")
+    if failed:
+        st.warning("Could not render: " + ", ".join(f"#{order_id} ({err})" for order_id, err in failed.items()))
+    if done and st.button("📦 Prepare ZIP of receipts"):
+        st.session_state.receipt_zip = screenshots.zip_files(done, downloads.new_path("receipts.zip"))
+    archive = st.session_state.get("receipt_zip")
+    if archive and os.path.exists(archive):  # swept after downloads.MAX_AGE
+        st.markdown(downloads.link(archive, "⬇ Download receipts as ZIP"), unsafe_allow_html=True)
+
+
+ORDER_TABLE_COLUMNS = ["Order ID","Placed At","Name","Address","Phone","Pincode","Payment",
+                       "GPay Number","Transaction ID","Items","Screenshot"]
+
+# ---- ADMIN PAGE ----
+st.header("🔑 Admin Dashboard")
+st.success("Welcome Admin! Here are all the orders 👇")
+
+f1, f2, f3 = st.columns(3)
+with f1:
+    placed = st.date_input("Placed between", value=())
+with f2:
+    payment = st.selectbox("Payment", ["All", "Cash on Delivery", "GPay"])
+with f3:
+    pincode = st.text_input("Pincode")
+s1, s2 = st.columns([3, 1])
+with s1:
+    search = st.text_input("Search name or phone")
+with s2:
+    page_size = st.selectbox("Rows per page", [25, 50, 100, 200], index=1)
+
+filters = OrderFilters(
+    date_from=placed[0] if len(placed) > 0 else None,
+    date_to=placed[1] if len(placed) > 1 else None,
+    payment=None if payment == "All" else payment,
+    pincode=pincode or None,
+    text=search or None,
+)
+# Keyset cursors for the pages visited so far; reset when filters change
+if st.session_state.get("admin_filters") != (filters, page_size):
+    st.session_state.admin_filters = (filters, page_size)
+    st.session_state.admin_cursors = [None]
+
+with perf.section("load_orders"):
+    total = count_orders(filters, orders_db.latest_order_id())
+    orders = orders_db.orders_page(filters, st.session_state.admin_cursors[-1], page_size)
+if not orders:
+    st.info("No orders placed yet." if total == 0 else "No more orders.")
+else:
+    page_no = len(st.session_state.admin_cursors)
+    st.caption(f"Page {page_no} of {-(-total // page_size)} · {total} matching orders")
+    df = pd.DataFrame(orders, columns=ORDER_TABLE_COLUMNS)
+    table = st.dataframe(df, use_container_width=True, hide_index=True,
+                         on_select="rerun", selection_mode="multi-row", key="admin_orders")
+
+    p1, p2 = st.columns(2)
+    with p1:
+        if st.button("⬅ Newer", disabled=page_no == 1):
+            st.session_state.admin_cursors.pop()
+            st.rerun()
+    with p2:
+        if st.button("Older ➡", disabled=len(orders) < page_size):
+            st.session_state.admin_cursors.append(orders[-1][0])
+            st.rerun()
+
+    shots = [(order[0], screenshots.existing_path(order[-1])) for order in orders]
+    shots = [(order_id, path) for order_id, path in shots if path]
+    if shots:
+        st.subheader("🧾 Payment Screenshots")
+        st.caption("Select rows in the table above to open full screenshots.")
+        cols = st.columns(6)
+        for i, (order_id, path) in enumerate(shots):
+            with cols[i % 6]:
+                st.image(screenshot_thumbnail(path, os.path.getmtime(path)),
+                         caption=f"Order {order_id}")
+
+    selected = [orders[row] for row in table.selection.rows]
+    selected_shots = [(order[0], screenshots.existing_path(order[-1])) for order in selected]
+    selected_shots = [(order_id, path) for order_id, path in selected_shots if path]
+    for order_id, path in selected_shots:
+        with st.expander(f"Screenshot for Order {order_id}", expanded=True):
+            st.image(path, width=300)
+            with open(path, "rb") as f:
+                st.download_button(
+                    label=f"⬇ Download Screenshot (Order {order_id})",
+                    data=f,
+                    file_name=os.path.basename(path),
+                    mime=mimetypes.guess_type(path)[0] or "application/octet-stream",
+                    key=f"shot_{order_id}"
+                )
+    for order in selected:
+        order_id = order[0]
+        if core.get_receipts().ready(order_id):
+            with open(core.get_receipts().path(order_id), "rb") as f:
+                st.download_button(f"🧾 Receipt for Order {order_id}", data=f, file_name=f"receipt-{order_id}.pdf",
+                                   mime="application/pdf", key=f"receipt_{order_id}")
+        elif st.button(f"🧾 Render receipt for Order {order_id}", key=f"render_{order_id}"):
+            core.get_receipts().submit(order_id)
+            st.toast(f"Receipt for order {order_id} is being prepared.")
+    if len(selected_shots) > 1 and st.button(f"📦 Prepare ZIP of {len(selected_shots)} screenshots"):
+        archive = screenshots.zip_files(selected_shots, downloads.new_path("screenshots.zip"))
+        st.markdown(downloads.link(archive, "⬇ Download selected as ZIP"), unsafe_allow_html=True)
+
+with st.expander("🧾 Receipts"):
+    day = st.date_input("Orders placed on (UTC)", value=date.today(), key="receipt_day")
+    if st.button("Render receipts for this day"):
+        # Rendered by the receipt pool; this rerun returns straight away
+        order_ids = orders_db.order_ids_on(day)
+        st.session_state.receipt_batch = dict(zip(order_ids, core.get_receipts().submit_many(order_ids)))
+        st.session_state.pop("receipt_zip", None)
+    jobs = st.session_state.get("receipt_batch")
+    if jobs and all(job.done() for job in jobs.values()):
+        receipt_summary(jobs)
+    elif jobs:
+        receipt_progress(jobs)
+    elif "receipt_batch" in st.session_state:
+        st.info("No orders on that day.")
+
+with st.expander("🚚 Dispatch"):
+    # Pinned to the newest order when the list was opened, so marking a
+    # zone never sweeps up an order that came in afterwards unseen.
+    if st.button("Refresh dispatch list") or "dispatch_upto" not in st.session_state:
+        st.session_state.dispatch_upto = orders_db.latest_order_id()
+    upto = st.session_state.dispatch_upto
+    zones = orders_db.dispatch_summary(upto)
+    if not zones:
+        st.info("Nothing waiting to be dispatched.")
+    for zone, count, zone_total, items in zones:
+        label = zone or "Outside delivery area"
+        st.markdown(f"**{label}** · {count} orders · ₹{zone_total}")
+        st.caption(" · ".join(f"{name} × {units}" for name, units in items))
+        with st.popover(f"Orders for {label}"):
+            st.dataframe(pd.DataFrame(orders_db.pending_orders(zone, upto), columns=ORDER_TABLE_COLUMNS),
+                         use_container_width=True, hide_index=True)
+        if st.button(f"✅ Mark {label} dispatched", key=f"dispatch_{label}"):
+            orders_db.mark_dispatched(zone, upto)
+            st.rerun()
+
+with st.expander("💳 GPay reconciliation"):
+    st.caption("Checks the GPay orders matching the filters above against a bank/UPI statement CSV "
+               "with a transaction id (UTR) column and an amount column. "
+               f"Uploads are limited to {screenshots.MAX_UPLOAD_BYTES // (1024 * 1024)} MB "
+               "(about 50,000 statement lines); split longer statements by date.")
+    statement = st.file_uploader("Statement CSV", type=["csv"], key="statement_csv")
+    if statement is not None and st.button("Reconcile"):
+        try:
+            with perf.section("reconcile"), st.spinner("Reconciling..."):
+                result = reconcile.reconcile(orders_db, statement, filters)
+        except reconcile.StatementError as e:
+            st.error(f"⚠️ {e}")
+        else:
+            st.caption(f"{result.statement_lines} statement lines · "
+                       f"{result.unclaimed} credits not claimed by any order in range")
+            for col, status in zip(st.columns(len(reconcile.STATUSES)), reconcile.STATUSES):
+                col.metric(status.replace("_", " ").capitalize(), result.counts[status])
+    problems = reconcile.issues(orders_db, filters)
+    if problems:
+        st.dataframe(pd.DataFrame(problems, columns=["Order ID","Placed At","Name","Phone","Transaction ID",
+                                                     "Total","Status","Statement Amount"]),
+                     use_container_width=True, hide_index=True)
+
+with st.expander("📦 Stock"):
+    st.caption("Units left per product. Leave blank to stop tracking a product (never sold out).")
+    products = list(core.catalog().values())
+    levels = core.stock()
+    edited = st.data_editor(
+        pd.DataFrame({"Product": [p["name"] for p in products],
+                      "Units left": pd.array([levels.get(p["id"]) for p in products], dtype="Int64")}),
+        disabled=["Product"], hide_index=True, use_container_width=True, key="stock_editor")
+    if st.button("Save stock"):
+        orders_db.set_stock({p["id"]: None if pd.isna(qty) else max(0, int(qty))
+                             for p, qty in zip(products, edited["Units left"])})
+        st.success("Stock updated.")
+
+with st.expander("📈 Sales analytics"):
+    with perf.section("sales_charts"):
+        charts = sales_chart_pngs(orders_db.latest_order_id())
+    if not charts:
+        st.info("No sales yet.")
+    for (title, png), col in zip(charts.items(), st.columns(2) * 2):
+        with col:
+            st.caption(title)
+            st.image(png)
+
+with st.expander("⬇ Export orders"):
+    st.caption("Exports every order matching the filters above, oldest first.")
+    fmt = st.selectbox("Format", order_export.available_formats())
+    if st.button("Prepare export"):
+        ext = order_export.FORMATS[fmt][1]
+        with perf.section("export_orders"), st.spinner("Exporting orders..."):
+            st.session_state.export_file = order_export.export_to_file(
+                orders_db, filters, fmt, downloads.new_path(f"orders.{ext}"))
+    export = st.session_state.get("export_file")
+    if export and os.path.exists(export):  # swept after downloads.MAX_AGE
+        name = os.path.basename(export)
+        st.markdown(downloads.link(export, f"⬇ Download {name}"), unsafe_allow_html=True)
+
+with st.expander("🗄 Archived orders"):
+    periods = order_archive.list_archives()
+    if periods:
+        period = st.selectbox("Month", periods)
+        st.caption("Read-only; the filters above apply here too (up to 200 newest matches).")
+        path = order_archive.archive_path(period)
+        archived = search_archive(period, filters, os.path.getmtime(path))
+        st.dataframe(pd.DataFrame(archived, columns=ORDER_TABLE_COLUMNS),
+                     use_container_width=True, hide_index=True)
+    else:
+        st.info("Nothing archived yet.")
+    st.divider()
+    cutoff = st.date_input("Archive orders placed before", value=date.today() - timedelta(days=365))
+    if st.button("Archive and compact"):
+        with perf.section("archive_orders"), st.spinner("Archiving orders..."):
+            moved = order_archive.archive_orders(orders_db, cutoff)
+            compacted = order_archive.compact(orders_db)
+        # The newest order id is unchanged, so cached counts would still include the moved orders
+        count_orders.clear()
+        st.success(f"Archived {sum(moved.values())} orders into {len(moved)} monthly files.")
+        if not compacted:
+            st.info("Freed space was not compacted: this database predates incremental vacuum. "
+                    "Run `python order_archive.py --convert` once while the app is stopped.")
+        st.session_state.admin_cursors = [None]
+
+# Only present when the app runs with SMC_PERF=1
+if perf.ENABLED:
+    with st.expander("⏱ Performance"):
+        st.dataframe(
+            pd.DataFrame.from_dict(perf.stats(), orient="index").rename_axis("Section"),
+            use_container_width=True,
+        )
+        running, waiting = core.get_admission().load()
+        st.caption(f"Heavy slots: {running}/{core.HEAVY_SLOTS} in use, {waiting} waiting")
+        if perf.LOG_PATH:
+            st.caption(f"Samples are also appended to {perf.LOG_PATH}")
+
+if st.button("Logout"):
+    st.session_state.admin_logged = False
+    st.rerun()
@@ -0,0 +1,7 @@
+import streamlit as st
+
+import views
+
+# ---- CART PAGE ----
+st.header("🛒 Your Cart")
+views.cart_summary()
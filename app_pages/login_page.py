@@ -0,0 +1,18 @@
+import streamlit as st
+
+# ---- LOGIN PAGE ----
+# Signing in changes which pages green app.py registers; the rerun lands
+# on the new role's default page.
+st.title("🌱 Welcome to SMC STORE🌱")
+st.subheader("🔑 Sign In")
+email = st.text_input("Enter Email")
+password = st.text_input("Enter Password", type="password")
+if st.button("Sign In"):
+    if email == "admin" and password == "smctuty":
+        st.session_state.admin_logged = True
+        st.rerun()
+    elif email and password:
+        st.session_state.signed_in = True
+        st.rerun()
+    else:
+        st.error("⚠️ Please enter both Email and Password.")
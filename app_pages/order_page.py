@@ -0,0 +1,12 @@
+import streamlit as st
+
+import core
+import perf
+import views
+from lottie_assets import load_animation
+
+# ---- ORDER PAGE ----
+st.header("📦 Place Your Order")
+with perf.section("lottie_load"):
+    success_anim = load_animation("success")
+views.order_form(core.save_order, success_anim)
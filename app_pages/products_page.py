@@ -0,0 +1,8 @@
+import streamlit as st
+
+import core
+import views
+
+# ---- PRODUCTS PAGE ----
+st.header("🛒 Products")
+views.product_list(list(core.catalog().values()))
@@ -0,0 +1,57 @@
+import streamlit as st
+
+import core
+from image_variants import variant
+
+# ---- STORE PAGE ----
+st.image(variant("first.jpg", "content"), caption="🌾Welcome to SMC STORE🌾", use_container_width=True )
+
+st.markdown("""
+Welcome to 🌱**SMC STORE** 🌱  
+An initiative by **St. Mary’s College (Autonomous), Thoothukudi – Department of Botany**.  
+
+Our store proudly offers **eco-friendly, organic, and herbal products** crafted with care and scientific expertise by our Botany students. 🌿 
+""")
+
+
+st.image(variant("second.jpg", "content"), caption="Department of Botany", use_container_width=False)
+
+st.markdown("""
+## ✨ Why Choose Us?
+- 100% Natural and Sustainable Products 🍃  
+- Promoting Student Innovation and Entrepreneurship 🎓  
+- Supporting Local Farmers and Communities 👨‍🌾👩‍🌾  
+- Quality assured through academic research and practice 🔬  
+
+Together, we aim to blend **traditional knowledge with modern science**, ensuring health, sustainability, and innovation for a greener tomorrow. 🌍💚  
+""")
+
+st.markdown("""
+## 📞 Contact Info  
+**Dr. Sr. A. Arockia Jenecius Alphonse**  
+Head  
+Department of Botany  
+St. Mary’s College (Autonomous), Thoothukudi, Tamil Nadu  
+Contact No: +91 89407 39291  
+""")
+
+
+col1, col2 = st.columns([1, 2])
+with col1:
+    st.image(variant("third.jpg", "column"), use_container_width=True)
+
+st.markdown("""
+## 🌱 Our Promise 🌱  
+Every product is made with natural ingredients, ensuring **purity, freshness, and eco-friendliness.  
+""")
+
+st.markdown("""
+## 🌿 Our Mission  🌿
+To bring nature closer to people by providing sustainable herbal solutions while empowering students and farmers.  
+""")
+
+st.image(variant("fourth.jpg", "content"), caption="🌾 Freshness Guaranteed", use_container_width=True)
+
+
+if st.button("View Products"):
+    core.go("products")
@@ -0,0 +1,24 @@
+"""Store header rendered as plain markup instead of an 800px iframe.
+
+The styles live in assets/theme.css under "Store banner", so the header
+costs a few hundred bytes of HTML and no extra document, script or
+compositor layer.
+"""
+import html
+
+HEADER = """<header class="smc-banner-header">
+<h1>SMC STORE</h1>
+<p>BY,</p>
+<p>DEPARTMENT OF BOTANY</p>
+<p>ST. MARY'S COLLEGE (AUTONOMOUS)</p>
+<p>RE-ACCREDITED WITH 'A' GRADE BY NAAC</p>
+<p>THOOTHUKUDI, TAMILNADU, INDIA</p>
+</header>"""
+
+CARD = """<div class="smc-card"><h3>{name}</h3><p>₹{price}</p></div>"""
+
+
+def render(products):
+    """Banner markup for ``st.markdown(..., unsafe_allow_html=True)``."""
+    cards = "".join(CARD.format(name=html.escape(p["name"]), price=p["price"]) for p in products)
+    return f'<div class="smc-banner">{HEADER}<section class="smc-products">{cards}</section></div>'
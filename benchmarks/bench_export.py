@@ -0,0 +1,56 @@
+"""Time and peak memory of a full order export, per format.
+
+    python benchmarks/bench_export.py --orders 100000 --formats CSV Excel Parquet
+
+Each format runs in a fresh subprocess so its peak RSS is its own.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import peak_rss_mb, seed_orders
+
+import order_export
+from order_store import OrderFilters, OrderStore
+
+
+def export_once(db, fmt):
+    store = OrderStore(db, pool_size=1)
+    path = os.path.join(os.path.dirname(db), f"export-{fmt}")
+    started = time.perf_counter()
+    order_export.export_to_file(store, OrderFilters(), fmt, path)
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(path)
+    os.remove(path)
+    store.close()
+    return {"format": fmt, "seconds": round(elapsed, 2), "mb": round(size / 2**20, 1),
+            "peak_rss_mb": peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--formats", nargs="+", default=order_export.available_formats())
+    parser.add_argument("--db", help=argparse.SUPPRESS)  # set for the per-format child
+    args = parser.parse_args()
+
+    if args.db:
+        print(json.dumps(export_once(args.db, args.formats[0])))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "orders.db")
+        seed_orders(db, args.orders)
+        print(f"{args.orders} orders")
+        for fmt in args.formats:
+            out = subprocess.run([sys.executable, __file__, "--db", db, "--formats", fmt],
+                                 check=True, capture_output=True, text=True).stdout
+            r = json.loads(out)
+            print(f"  {fmt:<8} {r['seconds']:>6.2f}s  {r['mb']:>6.1f} MB  peak RSS {r['peak_rss_mb']} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Server time per shopper click: full-script rerun vs fragment-scoped rerun.
+
+    python benchmarks/bench_interactions.py --clicks 50
+
+"before" drives ``green app.py`` with streamlit's AppTest, which reruns
+the whole script on every click, as every click did before the products
+and cart views became fragments.  "after" runs only the fragment through
+AppTest.from_function, which is the work a fragment rerun does in a real
+session.  The store uses a throwaway orders.db.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from common import APP, ROOT, summarize
+
+from streamlit.testing.v1 import AppTest
+
+from cart import Cart
+from core import PAGE_FILES
+
+
+def products_fragment():
+    import os
+    import streamlit as st
+    from cart import Cart
+    from order_store import OrderStore
+    import views
+
+    @st.cache_resource
+    def catalog():
+        store = OrderStore(os.environ["SMC_DB_FILE"], pool_size=1)
+        try:
+            return store.list_products()
+        finally:
+            store.close()
+
+    if "cart" not in st.session_state:
+        st.session_state.cart = Cart()
+    views.product_list(catalog())
+
+
+def cart_fragment():
+    import streamlit as st
+    from cart import Cart
+    import views
+
+    if "cart" not in st.session_state:
+        st.session_state.cart = Cart()
+        st.session_state.cart.add({"id": 1, "name": "Dry amla", "price": 100})
+    views.cart_summary()
+
+
+def time_clicks(at, label_prefix, clicks):
+    samples = []
+    for _ in range(clicks):
+        button = next(b for b in at.button if b.label.startswith(label_prefix))
+        started = time.perf_counter()
+        button.click().run()
+        samples.append(time.perf_counter() - started)
+        assert not at.exception, at.exception
+    return summarize(samples)
+
+
+def full_app(page, cart_line=None):
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.session_state["signed_in"] = True
+    if cart_line:
+        cart = Cart()
+        cart.add(cart_line)
+        at.session_state["cart"] = cart
+    at.run()
+    return at.switch_page(PAGE_FILES[page]).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clicks", type=int, default=30)
+    parser.add_argument("--json", action="store_true", help="print a single JSON object")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # images and assets are referenced relative to the repo
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SMC_DB_FILE"] = os.path.join(tmp, "orders.db")
+        line = {"id": 1, "name": "Dry amla", "price": 100}
+        results = {
+            "add_to_cart": {
+                "before": time_clicks(full_app("products"), "Add to Cart", args.clicks),
+                "after": time_clicks(AppTest.from_function(products_fragment).run(),
+                                     "Add to Cart", args.clicks),
+            },
+            "cart_plus": {
+                "before": time_clicks(full_app("cart", line), "➕", args.clicks),
+                "after": time_clicks(AppTest.from_function(cart_fragment).run(), "➕", args.clicks),
+            },
+        }
+
+    if args.json:
+        print(json.dumps({"clicks": args.clicks, **results}))
+        return
+    for interaction, r in results.items():
+        print(interaction)
+        for label, stats in r.items():
+            print(f"  {label:<6} mean {stats['mean_ms']:>8.2f} ms   p95 {stats['p95_ms']:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Headless load test of the shopper and admin flows with streamlit's AppTest.
+
+    python benchmarks/bench_load.py --orders 10000 --sessions 8 --flows 5 --out baseline.json
+
+Each simulated session runs full login -> store -> products -> cart ->
+order flows (or admin dashboard loads) against a temporary orders.db
+pre-seeded with ``--orders`` rows.  Sessions run in their own processes,
+since AppTest drives a process-wide Streamlit runtime that parallel
+AppTests in one process tear down under each other.  Vendored Lottie files, if any, are used and
+the remote refresh is forced off, so no request leaves the machine.
+Reports reruns/sec, per-rerun latency percentiles per step and peak RSS
+per session process as one JSON document.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from common import APP, ROOT, peak_rss_mb, seed_orders, summarize
+
+from streamlit.testing.v1 import AppTest
+
+_samples = defaultdict(list)  # step name -> rerun seconds, for this process's session
+
+
+class Session:
+    """One browser tab: an AppTest plus per-step rerun timing."""
+
+    def __init__(self):
+        self.at = AppTest.from_file(APP, default_timeout=120)
+
+    def step(self, name, action=None):
+        started = time.perf_counter()
+        (action() if action else self.at).run()
+        elapsed = time.perf_counter() - started
+        if self.at.exception:
+            raise RuntimeError(f"{name}: {self.at.exception[0].message}")
+        _samples[name].append(elapsed)
+
+    def button(self, prefix):
+        return next(b for b in self.at.button if b.label.startswith(prefix))
+
+    def sign_in(self, email, password):
+        self.at.text_input[0].input(email)
+        self.at.text_input[1].input(password)
+        self.step("sign_in", self.button("Sign In").click)
+
+
+def shopper_flow(rng):
+    s = Session()
+    s.step("login_page")
+    s.sign_in(f"shopper{rng.randint(1, 10**6)}@example.com", "pw")
+    s.step("view_products", s.button("View Products").click)
+    for _ in range(rng.randint(1, 4)):
+        adds = [b for b in s.at.button if b.label.startswith("Add to Cart")]
+        s.step("add_to_cart", rng.choice(adds).click)
+    s.step("view_cart", s.button("View Cart").click)
+    s.step("place_order", s.button("Place Order").click)
+    s.at.text_input[0].input("Load Test Shopper")
+    s.at.text_area[0].input("1 Beach Road, Thoothukudi")
+    s.at.text_input[1].input("9000000000")
+    s.at.text_input[2].input("628001")
+    # Confirm Order stays disabled until a rerun has validated the pincode
+    s.step("enter_details")
+    s.step("confirm_order", s.button("Confirm Order").click)
+
+
+def admin_flow(rng):
+    s = Session()
+    s.step("login_page")
+    s.sign_in("admin", "smctuty")
+    for _ in range(rng.randint(1, 3)):
+        older = s.button("Older")
+        if older.disabled:
+            break
+        s.step("admin_next_page", older.click)
+
+
+def run_session(flows, admin_share, seed):
+    rng = random.Random(seed)
+    for _ in range(flows):
+        (admin_flow if rng.random() < admin_share else shopper_flow)(rng)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=10_000, help="orders to pre-seed (e.g. 10000, 100000)")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent simulated sessions")
+    parser.add_argument("--flows", type=int, default=5, help="flows per session")
+    parser.add_argument("--admin-share", type=float, default=0.1, help="fraction of flows that are admin loads")
+    parser.add_argument("--out", help="also write the JSON baseline to this file")
+    parser.add_argument("--session", type=int, help=argparse.SUPPRESS)  # set for each session's child
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # images and assets are referenced relative to the repo
+    os.environ.pop("SMC_LOTTIE_REFRESH", None)
+    if args.session is not None:
+        run_session(args.flows, args.admin_share, args.session)
+        print(json.dumps({"samples": _samples, "peak_rss_mb": peak_rss_mb()}))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SMC_DB_FILE"] = os.path.join(tmp, "orders.db")
+        seeded = time.perf_counter()
+        seed_orders(os.environ["SMC_DB_FILE"], args.orders)
+        seed_seconds = time.perf_counter() - seeded
+
+        started = time.perf_counter()
+        children = [subprocess.Popen([sys.executable, __file__, "--flows", str(args.flows),
+                                      "--admin-share", str(args.admin_share), "--session", str(i)],
+                                     stdout=subprocess.PIPE, text=True)
+                    for i in range(args.sessions)]
+        results = []
+        for child in children:
+            out, _ = child.communicate()
+            if child.returncode:
+                raise SystemExit(f"session process exited with {child.returncode}")
+            results.append(json.loads(out.splitlines()[-1]))  # the report is the last line
+        elapsed = time.perf_counter() - started
+
+    samples = defaultdict(list)
+    for result in results:
+        for name, times in result["samples"].items():
+            samples[name].extend(times)
+    all_samples = [s for times in samples.values() for s in times]
+    report = {
+        "orders_seeded": args.orders,
+        "seed_seconds": round(seed_seconds, 2),
+        "sessions": args.sessions,
+        "flows_per_session": args.flows,
+        "reruns": len(all_samples),
+        "reruns_per_sec": round(len(all_samples) / elapsed, 2),
+        "rerun": summarize(all_samples),
+        "steps": {name: summarize(times) for name, times in sorted(samples.items())},
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in results),
+        "peak_rss_mb_per_session": [r["peak_rss_mb"] for r in results],
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
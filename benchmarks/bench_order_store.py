@@ -0,0 +1,127 @@
+"""Orders/sec with N concurrent writers: legacy connect-per-call vs OrderStore vs OrderWriter.
+
+    python benchmarks/bench_order_store.py --writers 8 --orders 200
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from order_store import OrderStore  # noqa: E402
+from order_writer import OrderWriter  # noqa: E402
+
+SAMPLE_ORDER = {
+    "name": "Bench Shopper",
+    "address": "1 Beach Road, Thoothukudi",
+    "phone": "9000000000",
+    "pincode": "628001",
+    "payment": "Cash on Delivery",
+    "transaction": "N/A",
+    "screenshot": "N/A",
+    "items": [{"id": 2, "name": "Ragi powder", "price": 100, "images": ["TWO.jpg"]}],
+    "gpay_number": "N/A",
+}
+
+
+class LegacyStore:
+    """The original green app.py behaviour: one connection per statement."""
+
+    def __init__(self, path):
+        self.path = path
+        conn = sqlite3.connect(path)
+        conn.execute("""CREATE TABLE IF NOT EXISTS orders
+                        (name TEXT, address TEXT, phone TEXT, pincode TEXT,
+                         payment TEXT, gpay_number TEXT, txn_id TEXT,
+                         items TEXT, screenshot TEXT)""")
+        conn.commit()
+        conn.close()
+
+    def save_order(self, order):
+        conn = sqlite3.connect(self.path)
+        conn.execute("""INSERT INTO orders
+                        (name, address, phone, pincode, payment, gpay_number, txn_id, items, screenshot)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                     (order["name"], order["address"], order["phone"], order["pincode"],
+                      order["payment"], order.get("gpay_number"), order.get("transaction"),
+                      str(order.get("items")), order.get("screenshot")))
+        conn.commit()
+        conn.close()
+
+    def close(self):
+        pass
+
+
+class WriteBehindStore:
+    """OrderWriter behind the save_order interface: submit, then wait for the group commit."""
+
+    def __init__(self, path, pool_size):
+        self.store = OrderStore(path, pool_size=pool_size)
+        self.writer = OrderWriter(self.store, path + ".journal")
+
+    def save_order(self, order):
+        return self.writer.submit(order).result()
+
+    def close(self):
+        self.store.close()
+
+
+def run(store, writers, orders_per_writer):
+    errors = []
+    start_gate = threading.Barrier(writers + 1)
+
+    def writer():
+        start_gate.wait()
+        for _ in range(orders_per_writer):
+            try:
+                store.save_order(SAMPLE_ORDER)
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    start_gate.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    saved = writers * orders_per_writer - len(errors)
+    return {"orders_per_sec": round(saved / elapsed, 1), "seconds": round(elapsed, 3),
+            "saved": saved, "errors": len(errors)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--orders", type=int, default=200, help="orders per writer")
+    parser.add_argument("--json", action="store_true", help="print a single JSON object")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, factory in (("before", LegacyStore),
+                               ("after", lambda path: OrderStore(path, pool_size=args.writers)),
+                               ("behind", lambda path: WriteBehindStore(path, pool_size=2))):
+            store = factory(os.path.join(tmp, f"{label}.db"))
+            try:
+                results[label] = run(store, args.writers, args.orders)
+            finally:
+                store.close()
+
+    if args.json:
+        print(json.dumps({"writers": args.writers, "orders_per_writer": args.orders, **results}))
+        return
+    print(f"{args.writers} writers x {args.orders} orders")
+    for label, r in results.items():
+        print(f"  {label:<6} {r['orders_per_sec']:>9.1f} orders/s  "
+              f"{r['seconds']:.3f}s  errors={r['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Helpers shared by the benchmark scripts."""
+import os
+import random
+import resource
+import statistics
+import sys
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from order_store import OrderStore, insert_order  # noqa: E402
+
+APP = os.path.join(ROOT, "green app.py")
+
+SEED_PINCODES = ("628001", "628002", "628003", "628005", "628008", "628101", "628151", "628201")
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {"count": len(samples),
+            "mean_ms": round(statistics.mean(samples) * 1000, 2),
+            "p50_ms": round(samples[int(0.50 * (len(samples) - 1))] * 1000, 2),
+            "p95_ms": round(samples[int(0.95 * (len(samples) - 1))] * 1000, 2)}
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def seed_orders(path, count, days=365, rng=None):
+    """Fill ``path`` with ``count`` plausible orders spread over ``days``.
+
+    Orders go through ``insert_order`` so everything the store maintains
+    alongside an order is seeded too.
+    """
+    rng = rng or random.Random(42)
+    store = OrderStore(path, pool_size=1)
+    try:
+        products = store.list_products()
+        now = datetime.utcnow()
+        with store.transaction() as conn:
+            for n in range(count):
+                gpay = rng.random() < 0.6
+                placed = now - timedelta(seconds=rng.randint(0, days * 86400))
+                insert_order(conn, {
+                    "name": f"Shopper {n}",
+                    "address": f"{n} Beach Road, Thoothukudi",
+                    "phone": f"9{n:09d}",
+                    "pincode": rng.choice(SEED_PINCODES),
+                    "payment": "GPay" if gpay else "Cash on Delivery",
+                    "transaction": f"T{n:012d}" if gpay else "N/A",
+                    "gpay_number": "89407 39291" if gpay else "N/A",
+                    "screenshot": "N/A",
+                    "items": [dict(p, qty=rng.randint(1, 3))
+                              for p in rng.sample(products, rng.randint(1, 3))],
+                }, created_at=placed.strftime("%Y-%m-%d %H:%M:%S"))
+    finally:
+        store.close()
@@ -0,0 +1,49 @@
+"""Shopping cart kept in ``st.session_state``.
+
+Lines are keyed by product id with a quantity, and the item count and
+total are updated on every change, so session memory grows with distinct
+products rather than clicks and nothing is re-summed on a rerun.
+"""
+
+
+class Cart:
+    def __init__(self):
+        self.lines = {}  # product id -> {"id", "name", "price", "qty"}
+        self.count = 0
+        self.total = 0
+
+    def __bool__(self):
+        return bool(self.lines)
+
+    def add(self, product, qty=1):
+        line = self.lines.get(product["id"])
+        if line is None:
+            line = self.lines[product["id"]] = {
+                "id": product["id"], "name": product["name"], "price": product["price"], "qty": 0}
+        line["qty"] += qty
+        self.count += qty
+        self.total += line["price"] * qty
+
+    def remove(self, product_id, qty=1):
+        line = self.lines.get(product_id)
+        if line is None:
+            return
+        qty = min(qty, line["qty"])
+        line["qty"] -= qty
+        self.count -= qty
+        self.total -= line["price"] * qty
+        if not line["qty"]:
+            del self.lines[product_id]
+
+    def quantity(self, product_id):
+        line = self.lines.get(product_id)
+        return line["qty"] if line else 0
+
+    def clear(self):
+        self.lines.clear()
+        self.count = 0
+        self.total = 0
+
+    def order_items(self):
+        """Snapshot of the lines for ``save_order``."""
+        return [dict(line) for line in self.lines.values()]
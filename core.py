@@ -0,0 +1,134 @@
+"""State and resources shared by every page of the store.
+
+Kept small on purpose: this is imported on every rerun of every page, so
+anything heavy (pandas, PIL, matplotlib) belongs in the page that needs it.
+"""
+import os
+from concurrent.futures import wait as wait_for
+from contextlib import contextmanager
+
+import streamlit as st
+
+import perf
+from admission import AdmissionController, TokenBucket
+from cart import Cart
+from order_store import OrderStore
+from order_writer import OrderWriter
+from receipts import ReceiptRenderer
+
+
+def db_file():
+    # Read when the store is first built, not at import: benchmarks and tests
+    # import core before pointing SMC_DB_FILE at a throwaway database.
+    return os.environ.get("SMC_DB_FILE", "orders.db")
+
+
+# Concurrent checkout writes and admin loads, and how long a rerun may wait for one
+HEAVY_SLOTS = int(os.environ.get("SMC_HEAVY_SLOTS", "4"))
+HEAVY_WAIT = float(os.environ.get("SMC_HEAVY_WAIT", "2.0"))
+
+# Per-session click limits: (tokens per second, burst)
+RATE_LIMITS = {
+    "cart": (4.0, 12),
+    "confirm": (0.2, 3),
+}
+
+# Page scripts, relative to green app.py.  Not in pages/, which Streamlit
+# would also pick up as a multipage directory alongside st.navigation.
+PAGE_FILES = {
+    "login": "app_pages/login_page.py",
+    "store": "app_pages/store_page.py",
+    "products": "app_pages/products_page.py",
+    "cart": "app_pages/cart_page.py",
+    "order": "app_pages/order_page.py",
+    "admin": "app_pages/admin_page.py",
+}
+SHOP_PAGES = ("store", "products", "cart", "order")
+
+
+@st.cache_resource
+def get_order_store():
+    with perf.section("init_db"):
+        return OrderStore(db_file())
+
+
+@st.cache_resource
+def get_order_writer():
+    # One writer per process: it owns the journal next to the database
+    return OrderWriter(get_order_store(), db_file() + ".journal")
+
+
+@st.cache_resource
+def get_receipts():
+    return ReceiptRenderer(get_order_store())
+
+
+def save_order(order, wait=5.0):
+    """Hand ``order`` to the writer and wait up to ``wait`` s for its commit.
+
+    Returns the order's future, still running if the writer is behind; it
+    can yet fail (e.g. ``OutOfStock``), so keep it until it resolves.  A
+    queued order is journaled, so it is saved even if this process restarts
+    before the writer catches up.
+    """
+    future = get_order_writer().submit(order)
+    wait_for([future], timeout=wait)
+    return future
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_catalog(version):
+    # version comes from a trigger-maintained counter, so edits to the
+    # products table invalidate this without polling the whole table
+    return {p["id"]: p for p in get_order_store().list_products()}
+
+
+def catalog():
+    return load_catalog(get_order_store().catalog_version())
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_stock(version):
+    # Keyed like load_catalog: every sale or restock bumps the version
+    return get_order_store().stock_levels()
+
+
+def stock():
+    """``{product_id: units left}``; untracked products are absent."""
+    return load_stock(get_order_store().stock_version())
+
+
+@st.cache_resource
+def get_admission():
+    return AdmissionController(HEAVY_SLOTS, HEAVY_WAIT)
+
+
+def busy():
+    """The lightweight response for a shopper who is over a limit."""
+    st.warning("⏳ The store is very busy right now. Please retry in a few seconds.")
+    st.button("🔄 Retry", key="busy_retry")
+
+
+@contextmanager
+def heavy():
+    """Run the block in one of the process-wide heavy slots; raises ``admission.Busy`` if none frees up."""
+    with get_admission().slot():
+        yield
+
+
+def allow(action):
+    """Take a token from this session's bucket for ``action``; False when over the limit."""
+    buckets = st.session_state.setdefault("rate_buckets", {})
+    if action not in buckets:
+        buckets[action] = TokenBucket(*RATE_LIMITS[action])
+    return buckets[action].take()
+
+
+def init_session():
+    if "cart" not in st.session_state: st.session_state.cart = Cart()
+    if "signed_in" not in st.session_state: st.session_state.signed_in = False
+    if "admin_logged" not in st.session_state: st.session_state.admin_logged = False
+
+
+def go(page):
+    st.switch_page(PAGE_FILES[page])
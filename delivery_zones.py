@@ -0,0 +1,31 @@
+"""Pincodes the store delivers to, and the delivery zone each belongs to.
+
+The list ships with the app in ``assets/pincodes.csv`` (pincode, zone,
+district) and is read into a dict once per process, so checking a pincode
+on the order form is a single lookup.  Edit the CSV to change the
+delivery area; orders keep the zone they were placed with.
+"""
+import csv
+import functools
+import os
+from typing import NamedTuple
+
+PINCODES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "pincodes.csv")
+
+
+class Zone(NamedTuple):
+    zone: str
+    district: str
+
+
+@functools.lru_cache(maxsize=None)
+def load_zones(path=PINCODES_FILE):
+    """``{pincode: Zone}`` for every deliverable pincode."""
+    with open(path, encoding="utf-8", newline="") as f:
+        return {row["pincode"].strip(): Zone(row["zone"].strip(), row["district"].strip())
+                for row in csv.DictReader(f)}
+
+
+def zone_for(pincode):
+    """The Zone for ``pincode``, or None if we don't deliver there."""
+    return load_zones().get((pincode or "").strip())
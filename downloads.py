@@ -0,0 +1,73 @@
+"""Large admin downloads (ZIPs, exports) served from disk, not from memory.
+
+``st.download_button`` reads whatever it is given fully into memory and
+keeps it in the session's media storage, so big files are written under
+``static/downloads/<token>/`` instead and offered as a link.  With
+``server.enableStaticServing`` (see .streamlit/config.toml) Streamlit
+streams them straight from disk.  The token is random, so links cannot
+be guessed.  Files older than ``MAX_AGE`` are removed by a sweeper
+thread that runs at process start and every ``SWEEP_INTERVAL`` seconds
+after, so an export of customer details never outlives ``MAX_AGE`` by
+more than that, whether or not anything else is published.
+"""
+import html
+import os
+import secrets
+import shutil
+import threading
+import time
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.abspath(__file__))  # next to green app.py
+DOWNLOAD_DIR = os.path.join(ROOT, "static", "downloads")
+URL_PREFIX = "app/static/downloads"
+MAX_AGE = 3600
+SWEEP_INTERVAL = 60
+
+_sweeper_started = threading.Event()
+
+
+def sweep(max_age=MAX_AGE):
+    """Remove downloads published more than ``max_age`` seconds ago."""
+    if not os.path.isdir(DOWNLOAD_DIR):
+        return
+    cutoff = time.time() - max_age
+    for token in os.listdir(DOWNLOAD_DIR):
+        path = os.path.join(DOWNLOAD_DIR, token)
+        try:
+            expired = os.path.getmtime(path) < cutoff
+        except OSError:
+            continue  # removed by a concurrent sweep
+        if expired:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _sweep_forever(interval):
+    while True:
+        sweep()
+        time.sleep(interval)
+
+
+def start_sweeper(interval=SWEEP_INTERVAL):
+    """Start the background sweep once per process."""
+    if _sweeper_started.is_set():
+        return
+    _sweeper_started.set()
+    threading.Thread(target=_sweep_forever, args=(interval,), name="downloads-sweep", daemon=True).start()
+
+
+def new_path(filename):
+    """A fresh path to write ``filename`` to, inside its own unguessable directory."""
+    sweep()
+    folder = os.path.join(DOWNLOAD_DIR, secrets.token_urlsafe(16))
+    os.makedirs(folder)
+    return os.path.join(folder, filename)
+
+
+def link(path, label):
+    """HTML for a same-origin download link to a file written at ``new_path``."""
+    token, filename = os.path.relpath(path, DOWNLOAD_DIR).split(os.sep)
+    url = f"{URL_PREFIX}/{token}/{quote(filename)}"
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    return (f'<a href="{url}" download="{html.escape(filename)}">{html.escape(label)}</a> '
+            f"({size_mb:.1f} MB)")
@@ -0,0 +1,79 @@
+"""Resized, recompressed copies of the store's photos for each display slot.
+
+``st.image("SIX.jpg", width=150)`` used to ship the full 326 KB original.
+``variant("SIX.jpg", "thumb")`` returns a path to a WebP (or progressive
+JPEG) scaled for that slot at 2x density, generated on first use into a
+content-hashed cache directory.  Run ``python image_variants.py`` at build
+time to pre-generate every preset.
+"""
+import functools
+import glob
+import hashlib
+import os
+import sys
+
+CACHE_DIR = os.path.join(".cache", "images")
+
+# Pixel widths per display slot, already doubled for high-density screens.
+PRESETS = {
+    "thumb": 300,    # product cards, st.image(width=150)
+    "logo": 400,     # header logo, width=200
+    "column": 600,   # images inside a narrow st.columns slot
+    "content": 1200, # use_container_width images
+}
+
+EXTENSIONS = ("webp", "jpg")
+
+
+def _content_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def _render(src, dest_stem, width):
+    # PIL is only needed when a variant is missing, so pages that find
+    # everything in the cache never import it.
+    from PIL import Image, features
+
+    use_webp = features.check("webp")
+    dest = f"{dest_stem}.{'webp' if use_webp else 'jpg'}"
+    with Image.open(src) as im:
+        if im.width > width:
+            im.draft("RGB", (width, width * im.height // im.width))
+            im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+        has_alpha = im.mode in ("RGBA", "LA", "P")
+        tmp = f"{dest}.{os.getpid()}.tmp"
+        if use_webp:
+            im.convert("RGBA" if has_alpha else "RGB").save(tmp, "WEBP", quality=80, method=4)
+        else:
+            im.convert("RGB").save(tmp, "JPEG", quality=80, optimize=True, progressive=True)
+    os.replace(tmp, dest)
+    return dest
+
+
+@functools.lru_cache(maxsize=256)
+def _variant(path, mtime, width):
+    stem = os.path.join(CACHE_DIR, f"{_content_hash(path)}-{width}")
+    for ext in EXTENSIONS:
+        if os.path.exists(f"{stem}.{ext}"):
+            return f"{stem}.{ext}"
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return _render(path, stem, width)
+
+
+def variant(path, preset):
+    """Path of the ``preset``-sized copy of ``path``; falls back to the original."""
+    try:
+        return _variant(path, os.path.getmtime(path), PRESETS[preset])
+    except OSError:
+        return path
+
+
+if __name__ == "__main__":
+    sources = sys.argv[1:] or sorted(glob.glob("*.jpg") + glob.glob("*.png"))
+    for src in sources:
+        for preset in PRESETS:
+            print(f"{src:<16} {preset:<8} -> {variant(src, preset)}")
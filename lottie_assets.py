@@ -0,0 +1,81 @@
+"""Lottie animations bundled with the app, with an optional background refresh.
+
+``assets/lottie/success.json`` is a check-mark animation drawn for this
+app, so the order confirmation animates with no network access.  Running
+``python lottie_assets.py`` replaces it with the lottiefiles.com original
+(``lf20_jbrw3hcz``), which should then be committed.  Bundled files are
+read from disk once per process.  Set ``SMC_LOTTIE_REFRESH=1`` to
+re-fetch the originals in a daemon thread; successful downloads land in
+``.cache/lottie`` and take precedence on the next start.  If neither copy
+is readable, ``load_animation`` returns None and the page falls back to
+``st.balloons()``.
+"""
+import functools
+import json
+import os
+import threading
+
+import requests
+
+# Only animations a page actually loads
+ANIMATIONS = {
+    "success": "https://assets2.lottiefiles.com/packages/lf20_jbrw3hcz.json",
+}
+
+BUNDLED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "lottie")
+CACHE_DIR = os.path.join(".cache", "lottie")
+REFRESH_TIMEOUT = 3.0
+
+_refresh_started = threading.Event()
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def load_animation(name):
+    """Animation JSON for ``name``, or None if neither copy is readable."""
+    return (_read_json(os.path.join(CACHE_DIR, f"{name}.json"))
+            or _read_json(os.path.join(BUNDLED_DIR, f"{name}.json")))
+
+
+def _download(name, url, timeout, out_dir=CACHE_DIR):
+    """Fetch one animation into ``out_dir``; True if a valid file was written."""
+    try:
+        r = requests.get(url, timeout=timeout)
+        if r.status_code != 200:
+            return False
+        data = r.json()
+    except (requests.RequestException, ValueError):
+        return False
+    if not isinstance(data, dict) or "layers" not in data:
+        return False
+    os.makedirs(out_dir, exist_ok=True)
+    tmp = os.path.join(out_dir, f".{name}.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, os.path.join(out_dir, f"{name}.json"))
+    return True
+
+
+def _refresh_all(timeout, out_dir=CACHE_DIR):
+    return {name: _download(name, url, timeout, out_dir) for name, url in ANIMATIONS.items()}
+
+
+def refresh_in_background(timeout=REFRESH_TIMEOUT):
+    """Start the remote refresh once per process if SMC_LOTTIE_REFRESH is set."""
+    if os.environ.get("SMC_LOTTIE_REFRESH") != "1" or _refresh_started.is_set():
+        return
+    _refresh_started.set()
+    threading.Thread(target=_refresh_all, args=(timeout,), name="lottie-refresh", daemon=True).start()
+
+
+if __name__ == "__main__":
+    # Vendor the originals into assets/lottie: python lottie_assets.py
+    for name, ok in _refresh_all(timeout=30, out_dir=BUNDLED_DIR).items():
+        print(f"{name}: {'saved to ' + BUNDLED_DIR if ok else 'download failed'}")
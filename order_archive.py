@@ -0,0 +1,223 @@
+"""Move old orders out of the live database into per-month archive files.
+
+    python order_archive.py 2025-01-01 [orders.db]
+    python order_archive.py --convert [orders.db]    # once, with the app stopped
+
+Orders placed before the cutoff are copied, with their items, products and
+screenshot rows, into ``archive/orders-YYYY-MM.db`` and deleted from the
+live database in small transactions, so checkouts only ever wait for one
+batch.  Screenshot files go to ``archive/screenshots`` once no live order
+points at them.  The sales summary tables are left alone: analytics keep
+covering all-time sales.
+
+Freed space is handed back with ``incremental_vacuum``, which only works
+on a database in auto_vacuum=INCREMENTAL mode.  New databases start in it;
+an older one needs a single full VACUUM to switch, which locks the whole
+database, so that is left to ``--convert`` while the app is stopped.
+Until then compaction is skipped and the space is reused by new orders.
+
+Archive files are plain SQLite databases that the admin page opens
+read-only for searching.
+"""
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import date
+
+from order_store import ORDER_COLUMNS, OrderFilters, OrderStore
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_PREFIX = "orders-"
+
+ARCHIVED_TABLES = ("products", "screenshots", "orders", "order_items")
+ARCHIVE_INDEXES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS arc.idx_orders_id ON orders(id)",
+    "CREATE INDEX IF NOT EXISTS arc.idx_orders_phone ON orders(phone)",
+    "CREATE INDEX IF NOT EXISTS arc.idx_orders_pincode ON orders(pincode)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS arc.idx_order_items_id ON order_items(id)",
+    "CREATE INDEX IF NOT EXISTS arc.idx_order_items_order ON order_items(order_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS arc.idx_products_id ON products(id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS arc.idx_screenshots_sha256 ON screenshots(sha256)",
+)
+
+PERIODS_SQL = """SELECT DISTINCT substr(created_at, 1, 7) FROM orders
+                  WHERE created_at < ? ORDER BY 1"""
+
+BATCH_IDS_SQL = """SELECT id, screenshot FROM orders
+                    WHERE created_at >= ? AND created_at < ? ORDER BY id LIMIT ?"""
+
+SCREENSHOT_IN_USE_SQL = "SELECT 1 FROM main.orders WHERE screenshot = ? LIMIT 1"
+
+DELETE_UNUSED_SCREENSHOT_SQL = """DELETE FROM main.screenshots WHERE path = ?1
+                    AND NOT EXISTS (SELECT 1 FROM main.orders WHERE screenshot = ?1)"""
+
+
+def archive_path(period, archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, f"{ARCHIVE_PREFIX}{period}.db")
+
+
+def _columns(conn, schema, table):
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _prepare_archive(conn):
+    """Create any archived table missing from the attached ``arc`` database."""
+    for table in ARCHIVED_TABLES:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS arc.{table} AS SELECT * FROM main.{table} WHERE 0")
+    for statement in ARCHIVE_INDEXES:
+        conn.execute(statement)
+
+
+def _copy_rows(conn, table, where):
+    # Column lists, not SELECT *: an archive written before a later
+    # migration added a column still accepts the rows it knows about.
+    cols = ", ".join(_columns(conn, "arc", table))
+    conn.execute(f"INSERT OR IGNORE INTO arc.{table} ({cols}) SELECT {cols} FROM main.{table} WHERE {where}")
+
+
+def _move_batch(conn, start, end, batch_size, shots_dir):
+    rows = conn.execute(BATCH_IDS_SQL, (start, end, batch_size)).fetchall()
+    if not rows:
+        return 0
+    # Copy files before touching the database; originals are removed after commit
+    moved = {}
+    for _, shot in rows:
+        if shot and shot not in moved and os.path.exists(shot):
+            moved[shot] = os.path.join(shots_dir, os.path.basename(shot))
+            if not os.path.exists(moved[shot]):
+                shutil.copy2(shot, moved[shot])
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM temp.archive_batch")
+        conn.executemany("INSERT INTO temp.archive_batch (id) VALUES (?)", [(r[0],) for r in rows])
+        batch = "SELECT id FROM temp.archive_batch"
+        _copy_rows(conn, "products", f"id IN (SELECT product_id FROM order_items WHERE order_id IN ({batch}))")
+        _copy_rows(conn, "screenshots", f"sha256 IN (SELECT screenshot_sha256 FROM orders WHERE id IN ({batch}))")
+        _copy_rows(conn, "orders", f"id IN ({batch})")
+        _copy_rows(conn, "order_items", f"order_id IN ({batch})")
+        conn.executemany("UPDATE arc.orders SET screenshot = ? WHERE screenshot = ?",
+                         [(new, old) for old, new in moved.items()])
+        conn.execute(f"DELETE FROM main.orders WHERE id IN ({batch})")  # items cascade
+        conn.executemany(DELETE_UNUSED_SCREENSHOT_SQL, [(old,) for old in moved])
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    for old in moved:
+        if conn.execute(SCREENSHOT_IN_USE_SQL, (old,)).fetchone() is None:
+            os.remove(old)
+    return len(rows)
+
+
+def archive_orders(store, before, archive_dir=ARCHIVE_DIR, batch_size=500):
+    """Move orders placed before ``before`` (a date) into monthly archives.
+
+    Returns ``{period: orders_moved}``.  Safe to rerun after an interruption:
+    rows already copied are ignored and each batch commits on its own.
+    Orders without a timestamp (migrated from the first version) are kept.
+    """
+    cutoff = before.isoformat()
+    shots_dir = os.path.join(archive_dir, "screenshots")
+    os.makedirs(shots_dir, exist_ok=True)
+    moved = {}
+    with store.connection() as conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+        for (period,) in conn.execute(PERIODS_SQL, (cutoff,)).fetchall():
+            year, month = map(int, period.split("-"))
+            end = date(year + month // 12, month % 12 + 1, 1).isoformat()
+            conn.execute("ATTACH DATABASE ? AS arc", (archive_path(period, archive_dir),))
+            try:
+                _prepare_archive(conn)
+                moved[period] = 0
+                while True:
+                    count = _move_batch(conn, f"{period}-01", min(end, cutoff), batch_size, shots_dir)
+                    if not count:
+                        break
+                    moved[period] += count
+            finally:
+                conn.execute("DETACH DATABASE arc")
+    return moved
+
+
+def incremental(store):
+    """Whether the database can give space back a step at a time."""
+    with store.connection() as conn:
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def convert(store):
+    """Switch an older database to auto_vacuum=INCREMENTAL with one full VACUUM.
+
+    VACUUM holds an exclusive lock for its whole run, so only do this with
+    the app stopped.
+    """
+    with store.connection() as conn:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+
+
+def compact(store, pages_per_step=1000):
+    """Give freed pages back to the filesystem and refresh planner statistics.
+
+    Space is returned a step at a time so a checkout never waits for more
+    than one short write.  Returns False, doing nothing, if the database
+    still needs ``convert``.
+    """
+    if not incremental(store):
+        return False
+    with store.connection() as conn:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        while free:
+            conn.execute(f"PRAGMA incremental_vacuum({pages_per_step})").fetchall()
+            left = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if left >= free:
+                break
+            free = left
+        # Bounded ANALYZE: samples each index instead of reading it whole
+        conn.execute("PRAGMA analysis_limit=1000")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    return True
+
+
+# ------------------ READ-ONLY SEARCH ------------------
+def list_archives(archive_dir=ARCHIVE_DIR):
+    """Archived periods (``YYYY-MM``), newest first."""
+    if not os.path.isdir(archive_dir):
+        return []
+    return sorted((name[len(ARCHIVE_PREFIX):-3] for name in os.listdir(archive_dir)
+                   if name.startswith(ARCHIVE_PREFIX) and name.endswith(".db")), reverse=True)
+
+
+def search_archive(period, filters=OrderFilters(), limit=200, archive_dir=ARCHIVE_DIR):
+    """Newest-first orders from one archived period, opened read-only."""
+    uri = "file:" + os.path.abspath(archive_path(period, archive_dir)) + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        where, params = filters.where()
+        sql = f"SELECT {ORDER_COLUMNS} FROM orders o WHERE {where} ORDER BY o.id DESC LIMIT ?"
+        return conn.execute(sql, (*params, limit)).fetchall()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == "--convert":
+        # One-off, with the app stopped: python order_archive.py --convert [orders.db]
+        store = OrderStore(sys.argv[2] if len(sys.argv) > 2 else "orders.db", pool_size=1)
+        if incremental(store):
+            print("already in auto_vacuum=INCREMENTAL mode")
+        else:
+            convert(store)
+            print("converted to auto_vacuum=INCREMENTAL")
+        store.close()
+        sys.exit()
+    # Scheduled run, e.g. monthly from cron: python order_archive.py 2025-01-01 [orders.db]
+    cutoff = date.fromisoformat(sys.argv[1])
+    store = OrderStore(sys.argv[2] if len(sys.argv) > 2 else "orders.db", pool_size=1)
+    for period, count in archive_orders(store, cutoff).items():
+        print(f"{archive_path(period)}: {count} orders")
+    if not compact(store):
+        print("not compacted: run `python order_archive.py --convert` once with the app stopped")
+    store.close()
@@ -0,0 +1,84 @@
+"""Streaming order export for the admin dashboard: CSV, XLSX or Parquet.
+
+Orders are read with ``OrderStore.iter_orders`` and written batch by batch
+into a file on disk, so memory use is bounded by the batch size rather
+than the size of the orders table.  The admin page writes it under
+``static/downloads`` (see downloads.py) so it is served from disk too.  The XLSX and Parquet writers are
+optional dependencies and are imported only when that format is chosen.
+"""
+import csv
+import importlib.util
+import io
+import os
+
+COLUMNS = ("Order ID", "Placed At", "Name", "Address", "Phone", "Pincode", "Payment",
+           "GPay Number", "Transaction ID", "Items", "Screenshot", "Total")
+
+# format: (module it needs, file extension, mime type)
+FORMATS = {
+    "CSV": (None, "csv", "text/csv"),
+    "Excel": ("openpyxl", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": ("pyarrow", "parquet", "application/vnd.apache.parquet"),
+}
+
+
+def available_formats():
+    """Formats whose writer is installed, in display order."""
+    return [name for name, (module, _, _) in FORMATS.items()
+            if module is None or importlib.util.find_spec(module) is not None]
+
+
+def write_csv(batches, out):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(COLUMNS)
+    for rows in batches:
+        writer.writerows(rows)
+    text.flush()
+    text.detach()  # leave ``out`` open for the caller
+
+
+def write_xlsx(batches, out):
+    from openpyxl import Workbook
+
+    # write_only streams rows to a temp file instead of building cell objects
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Orders")
+    ws.append(COLUMNS)
+    for rows in batches:
+        for row in rows:
+            ws.append(row)
+    wb.save(out)
+
+
+def write_parquet(batches, out):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([("Order ID", pa.int64())]
+                       + [(name, pa.string()) for name in COLUMNS[1:-1]]
+                       + [("Total", pa.int64())])
+    with pq.ParquetWriter(out, schema) as writer:
+        for rows in batches:
+            # one row group per batch
+            writer.write_batch(pa.record_batch(list(zip(*rows)), schema=schema))
+
+
+WRITERS = {"CSV": write_csv, "Excel": write_xlsx, "Parquet": write_parquet}
+
+
+def export_to_file(store, filters, fmt, path, batch_size=1000):
+    """Export orders matching ``filters`` as ``fmt`` to ``path``, written atomically."""
+    tmp = path + ".part"
+    batches = store.iter_orders(filters, batch_size)
+    try:
+        with open(tmp, "wb") as out:
+            WRITERS[fmt](batches, out)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    finally:
+        batches.close()
+    return path
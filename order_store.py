@@ -0,0 +1,616 @@
+"""SQLite order store shared by every Streamlit session in the process.
+
+Connections are opened once, tuned with WAL pragmas and handed out from a
+small pool, so a rerun never pays for ``sqlite3.connect`` or a full fsync.
+The schema is versioned with ``PRAGMA user_version`` and upgraded in place
+when the store is opened.
+"""
+import ast
+import queue
+import sqlite3
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import NamedTuple, Optional
+
+from delivery_zones import zone_for
+
+DB_FILE = "orders.db"
+
+# WAL lets the admin read while shoppers write; NORMAL only fsyncs at
+# checkpoints, which is still durable against application crashes.
+PRAGMAS = (
+    # Only takes effect on a new database; `order_archive.py --convert` switches old ones
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+
+SCHEMA_V1 = (
+    """CREATE TABLE products (
+           id INTEGER PRIMARY KEY,
+           name TEXT NOT NULL UNIQUE,
+           price INTEGER NOT NULL)""",
+    """CREATE TABLE orders (
+           id INTEGER PRIMARY KEY,
+           created_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now')),
+           name TEXT, address TEXT, phone TEXT, pincode TEXT,
+           payment TEXT, gpay_number TEXT, txn_id TEXT, screenshot TEXT,
+           total INTEGER NOT NULL DEFAULT 0)""",
+    """CREATE TABLE order_items (
+           id INTEGER PRIMARY KEY,
+           order_id INTEGER NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+           product_id INTEGER NOT NULL REFERENCES products(id),
+           quantity INTEGER NOT NULL,
+           unit_price INTEGER NOT NULL)""",
+    "CREATE INDEX idx_orders_phone ON orders(phone)",
+    "CREATE INDEX idx_orders_pincode ON orders(pincode)",
+    "CREATE INDEX idx_orders_created_at ON orders(created_at)",
+    "CREATE INDEX idx_order_items_order ON order_items(order_id)",
+    "CREATE INDEX idx_order_items_product ON order_items(product_id)",
+)
+
+# Statements are module constants so sqlite3's per-connection statement
+# cache compiles each one once and reuses it on every call.
+INSERT_ORDER_SQL = """INSERT INTO orders
+                 (created_at, order_key, name, address, phone, pincode, zone, payment, gpay_number, txn_id,
+                  screenshot, screenshot_sha256, total)
+                 VALUES (COALESCE(?, strftime('%Y-%m-%d %H:%M:%S', 'now')), ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 ON CONFLICT (order_key) DO NOTHING"""
+
+ORDER_KEY_EXISTS_SQL = "SELECT id FROM orders WHERE order_key = ?"
+
+INSERT_SCREENSHOT_SQL = """INSERT OR IGNORE INTO screenshots (sha256, path, size, mime)
+                 VALUES (:sha256, :path, :size, :mime)"""
+
+INSERT_ITEM_SQL = """INSERT INTO order_items (order_id, product_id, quantity, unit_price)
+                 VALUES (?, ?, ?, ?)"""
+
+# Conditional decrement: the row only changes if enough is left, so two
+# sessions can never both take the last jar.
+RESERVE_STOCK_SQL = """UPDATE stock SET quantity = quantity - ?
+                 WHERE product_id = ? AND quantity >= ?"""
+
+STOCK_TRACKED_SQL = "SELECT 1 FROM stock WHERE product_id = ?"
+
+SELECT_STOCK_SQL = "SELECT product_id, quantity FROM stock"
+
+STOCK_VERSION_SQL = "SELECT value FROM meta WHERE key = 'stock_version'"
+
+SET_STOCK_SQL = """INSERT INTO stock (product_id, quantity) VALUES (?, ?)
+                 ON CONFLICT (product_id) DO UPDATE SET quantity = excluded.quantity"""
+
+# Both aggregates walk idx_orders_pending, which holds undispatched orders only
+DISPATCH_ZONES_SQL = """SELECT o.zone, COUNT(*), SUM(o.total) FROM orders o
+                 WHERE o.dispatched_at IS NULL AND o.id <= ? GROUP BY o.zone ORDER BY o.zone"""
+
+# CROSS JOIN keeps orders as the outer loop, so items are only looked up for pending orders
+DISPATCH_ITEMS_SQL = """SELECT o.zone, p.name, SUM(oi.quantity) FROM orders o
+                 CROSS JOIN order_items oi ON oi.order_id = o.id
+                 JOIN products p ON p.id = oi.product_id
+                 WHERE o.dispatched_at IS NULL AND o.id <= ? GROUP BY o.zone, p.id ORDER BY o.zone, p.name"""
+
+MARK_DISPATCHED_SQL = """UPDATE orders SET dispatched_at = strftime('%Y-%m-%d %H:%M:%S', 'now')
+                 WHERE dispatched_at IS NULL AND zone IS ? AND id <= ?"""
+
+RECEIPT_ORDER_SQL = """SELECT id, created_at, name, address, phone, pincode, payment, txn_id, total
+                   FROM orders WHERE id = ?"""
+
+RECEIPT_ITEMS_SQL = """SELECT p.name, oi.quantity, oi.unit_price FROM order_items oi
+                   JOIN products p ON p.id = oi.product_id WHERE oi.order_id = ? ORDER BY oi.id"""
+
+SELECT_CATALOG_SQL = """SELECT id, name, price, image FROM products
+                   WHERE active ORDER BY position, id"""
+
+CATALOG_VERSION_SQL = "SELECT value FROM meta WHERE key = 'catalog_version'"
+
+ORDER_COLUMNS = """o.id, o.created_at, o.name, o.address, o.phone, o.pincode,
+                        o.payment, o.gpay_number, o.txn_id,
+                        (SELECT group_concat(p.name || ' x' || oi.quantity, ', ')
+                           FROM order_items oi JOIN products p ON p.id = oi.product_id
+                          WHERE oi.order_id = o.id) AS items,
+                        o.screenshot"""
+
+# Sales summaries, bumped by insert_order so the admin charts read a few
+# hundred summary rows instead of aggregating the whole order history.
+UPSERT_DAILY_SALES_SQL = """INSERT INTO daily_sales (day, orders, revenue)
+                 VALUES (date(COALESCE(?, 'now')), 1, ?)
+                 ON CONFLICT (day) DO UPDATE SET orders = orders + 1, revenue = revenue + excluded.revenue"""
+
+UPSERT_PRODUCT_SALES_SQL = """INSERT INTO product_sales (product_id, units, revenue)
+                 VALUES (?, ?, ?)
+                 ON CONFLICT (product_id) DO UPDATE SET units = units + excluded.units,
+                                                        revenue = revenue + excluded.revenue"""
+
+UPSERT_PAYMENT_SALES_SQL = """INSERT INTO payment_sales (payment, orders, revenue)
+                 VALUES (?, 1, ?)
+                 ON CONFLICT (payment) DO UPDATE SET orders = orders + 1, revenue = revenue + excluded.revenue"""
+
+UPSERT_PINCODE_SALES_SQL = """INSERT INTO pincode_sales (pincode, orders, revenue)
+                 VALUES (?, 1, ?)
+                 ON CONFLICT (pincode) DO UPDATE SET orders = orders + 1, revenue = revenue + excluded.revenue"""
+
+SALES_BY_DAY_SQL = """SELECT day, orders, revenue FROM daily_sales
+                   WHERE day >= date('now', ?) ORDER BY day"""
+
+SALES_BY_PRODUCT_SQL = """SELECT p.name, s.units, s.revenue FROM product_sales s
+                   JOIN products p ON p.id = s.product_id ORDER BY s.units DESC"""
+
+SALES_BY_PAYMENT_SQL = "SELECT payment, orders, revenue FROM payment_sales ORDER BY orders DESC"
+
+SALES_BY_PINCODE_SQL = "SELECT pincode, orders, revenue FROM pincode_sales ORDER BY orders DESC LIMIT ?"
+
+
+class OutOfStock(ValueError):
+    """Not enough stock left for some of the order's products."""
+
+    def __init__(self, product_ids):
+        super().__init__(f"out of stock: products {sorted(product_ids)}")
+        self.product_ids = product_ids
+
+
+class OrderFilters(NamedTuple):
+    """Admin dashboard filters, pushed down into the WHERE clause."""
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    payment: Optional[str] = None
+    pincode: Optional[str] = None
+    text: Optional[str] = None
+
+    def where(self):
+        clauses, params = [], []
+        if self.date_from:
+            clauses.append("o.created_at >= ?")
+            params.append(self.date_from.isoformat())
+        if self.date_to:
+            clauses.append("o.created_at < ?")
+            params.append((self.date_to + timedelta(days=1)).isoformat())
+        if self.payment:
+            clauses.append("o.payment = ?")
+            params.append(self.payment)
+        if self.pincode:
+            clauses.append("o.pincode = ?")
+            params.append(self.pincode.strip())
+        if self.text:
+            clauses.append("(o.name LIKE ? OR o.phone LIKE ?)")
+            params += [f"%{self.text.strip()}%"] * 2
+        return " AND ".join(clauses) or "1", params
+
+
+def cart_lines(items):
+    """Collapse cart lines (dicts with id, price and optional qty) into ``(product_id, price, quantity)``."""
+    counts = Counter()
+    for item in items or ():
+        counts[item["id"], item["price"]] += item.get("qty", 1)
+    return [(product_id, price, qty) for (product_id, price), qty in counts.items()]
+
+
+def normalize_txn(value):
+    """Transaction ids as banks print them: no surrounding space, upper case."""
+    return (value or "").strip().upper()
+
+
+def insert_order(conn, order, created_at=None):
+    """Insert ``order`` and its items; returns the order id.
+
+    An order whose ``order_key`` is already stored is not inserted again:
+    the id of the stored order is returned instead, so retries are free.
+    Raises ``OutOfStock`` if a tracked product has too few units left;
+    the caller's transaction then rolls back every reservation.
+    """
+    lines = cart_lines(order.get("items"))
+    total = sum(price * qty for _, price, qty in lines)
+    shot = order.get("screenshot_meta")
+    if shot:
+        conn.execute(INSERT_SCREENSHOT_SQL, shot)
+    zone = zone_for(order["pincode"])
+    txn = order.get("transaction")
+    txn = normalize_txn(txn) if txn is not None else None
+    cur = conn.execute(INSERT_ORDER_SQL, (
+        created_at, order.get("order_key"), order["name"], order["address"], order["phone"], order["pincode"],
+        zone.zone if zone else None, order["payment"], order.get("gpay_number"), txn,
+        order.get("screenshot"), shot["sha256"] if shot else None, total))
+    if cur.rowcount == 0:
+        return conn.execute(ORDER_KEY_EXISTS_SQL, (order["order_key"],)).fetchone()[0]
+    order_id = cur.lastrowid
+    short = [product_id for product_id, _, qty in lines
+             if conn.execute(RESERVE_STOCK_SQL, (qty, product_id, qty)).rowcount == 0
+             and conn.execute(STOCK_TRACKED_SQL, (product_id,)).fetchone()]
+    if short:
+        raise OutOfStock(short)
+    conn.executemany(INSERT_ITEM_SQL, [(order_id, product_id, qty, price)
+                                       for product_id, price, qty in lines])
+    conn.execute(UPSERT_DAILY_SALES_SQL, (created_at, total))
+    conn.executemany(UPSERT_PRODUCT_SALES_SQL, [(product_id, qty, price * qty)
+                                                for product_id, price, qty in lines])
+    conn.execute(UPSERT_PAYMENT_SALES_SQL, (order["payment"] or "", total))
+    conn.execute(UPSERT_PINCODE_SALES_SQL, (order["pincode"] or "", total))
+    return order_id
+
+
+# ------------------ MIGRATIONS ------------------
+# Migrations keep their own SQL so they keep working as the live schema moves on.
+def _table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _parse_legacy_items(text):
+    try:
+        items = ast.literal_eval(text) if text else []
+    except (ValueError, SyntaxError):
+        return []
+    return [i for i in items if isinstance(i, dict) and "name" in i and "price" in i]
+
+
+def migrate_v1(conn, batch_size=500):
+    """Create the normalized schema and stream any pre-versioning orders into it."""
+    legacy = _table_columns(conn, "orders")
+    if legacy:
+        conn.execute("ALTER TABLE orders RENAME TO orders_legacy")
+    for statement in SCHEMA_V1:
+        conn.execute(statement)
+    if not legacy:
+        return
+    # Legacy rows carry no timestamp; created_at is left NULL rather than
+    # inventing one, so date-range queries only count orders we can date.
+    cur = conn.execute("""SELECT name, address, phone, pincode, payment, gpay_number,
+                                 txn_id, items, screenshot
+                            FROM orders_legacy ORDER BY rowid""")
+    product_ids = {}
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+        for *fields, items, shot in rows:
+            counts = Counter((i["name"], i["price"]) for i in _parse_legacy_items(items))
+            order_id = conn.execute(
+                """INSERT INTO orders (created_at, name, address, phone, pincode, payment,
+                                       gpay_number, txn_id, screenshot, total)
+                   VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (*fields, shot, sum(price * qty for (_, price), qty in counts.items()))).lastrowid
+            for (name, price), qty in counts.items():
+                if name not in product_ids:
+                    product_ids[name] = conn.execute(
+                        """INSERT INTO products (name, price) VALUES (?, ?)
+                           ON CONFLICT(name) DO UPDATE SET price = excluded.price
+                           RETURNING id""", (name, price)).fetchone()[0]
+                conn.execute(INSERT_ITEM_SQL, (order_id, product_ids[name], qty, price))
+    conn.execute("DROP TABLE orders_legacy")
+
+
+CATALOG_SEED = (
+    # name, price, image
+    ("Dry amla", 100, "ONE.jpg"),
+    ("Ragi powder", 100, "TWO.jpg"),
+    ("Masala tea powder", 100, "THREE.jpg"),
+    ("Herbal hair growth oil", 80, "FOUR.jpg"),
+    ("Face pack powder", 100, "FIVE.jpg"),
+    ("Rose petal jam", 85, "SIX.jpg"),
+    ("Mushroom", 70, "TRI.jpg"),
+)
+
+
+def migrate_v2(conn):
+    """Make the products table the catalog: images, ordering, and a change counter."""
+    conn.execute("ALTER TABLE products ADD COLUMN image TEXT")
+    conn.execute("ALTER TABLE products ADD COLUMN position INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE products ADD COLUMN active INTEGER NOT NULL DEFAULT 1")
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    conn.execute("INSERT INTO meta (key, value) VALUES ('catalog_version', 0)")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(f"""CREATE TRIGGER products_{event.lower()}_version AFTER {event} ON products
+                         BEGIN UPDATE meta SET value = value + 1 WHERE key = 'catalog_version'; END""")
+    # Migrated products keep their ids (order_items point at them); products
+    # that only ever existed in old carts are kept but hidden.
+    conn.execute("UPDATE products SET active = 0")
+    for position, (name, price, image) in enumerate(CATALOG_SEED):
+        conn.execute("""INSERT INTO products (name, price, image, position, active)
+                        VALUES (?, ?, ?, ?, 1)
+                        ON CONFLICT(name) DO UPDATE SET price = excluded.price, image = excluded.image,
+                                                        position = excluded.position, active = 1""",
+                     (name, price, image, position))
+
+
+def migrate_v3(conn):
+    """Content-addressed payment screenshots, deduplicated by SHA-256."""
+    conn.execute("""CREATE TABLE screenshots (
+                        sha256 TEXT PRIMARY KEY,
+                        path TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        mime TEXT NOT NULL,
+                        uploaded_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now')))""")
+    conn.execute("ALTER TABLE orders ADD COLUMN screenshot_sha256 TEXT REFERENCES screenshots(sha256)")
+
+
+def migrate_v4(conn):
+    """Optional unique key per order, so a replayed or retried write is recognised."""
+    conn.execute("ALTER TABLE orders ADD COLUMN order_key TEXT")
+    conn.execute("CREATE UNIQUE INDEX idx_orders_order_key ON orders(order_key)")
+
+
+def migrate_v5(conn):
+    """Sales summary tables for the admin analytics, backfilled from existing orders."""
+    conn.execute("""CREATE TABLE daily_sales (
+                        day TEXT PRIMARY KEY, orders INTEGER NOT NULL, revenue INTEGER NOT NULL)""")
+    conn.execute("""CREATE TABLE product_sales (
+                        product_id INTEGER PRIMARY KEY REFERENCES products(id),
+                        units INTEGER NOT NULL, revenue INTEGER NOT NULL)""")
+    conn.execute("""CREATE TABLE payment_sales (
+                        payment TEXT PRIMARY KEY, orders INTEGER NOT NULL, revenue INTEGER NOT NULL)""")
+    conn.execute("""CREATE TABLE pincode_sales (
+                        pincode TEXT PRIMARY KEY, orders INTEGER NOT NULL, revenue INTEGER NOT NULL)""")
+    # Migrated orders without a timestamp count everywhere except per day
+    conn.execute("""INSERT INTO daily_sales (day, orders, revenue)
+                    SELECT date(created_at), COUNT(*), SUM(total) FROM orders
+                     WHERE created_at IS NOT NULL GROUP BY date(created_at)""")
+    conn.execute("""INSERT INTO product_sales (product_id, units, revenue)
+                    SELECT product_id, SUM(quantity), SUM(quantity * unit_price)
+                      FROM order_items GROUP BY product_id""")
+    conn.execute("""INSERT INTO payment_sales (payment, orders, revenue)
+                    SELECT COALESCE(payment, ''), COUNT(*), SUM(total) FROM orders
+                     GROUP BY COALESCE(payment, '')""")
+    conn.execute("""INSERT INTO pincode_sales (pincode, orders, revenue)
+                    SELECT COALESCE(pincode, ''), COUNT(*), SUM(total) FROM orders
+                     GROUP BY COALESCE(pincode, '')""")
+
+
+def migrate_v6(conn):
+    """Index screenshot paths, so archiving can tell which files are still in use."""
+    conn.execute("CREATE INDEX idx_orders_screenshot ON orders(screenshot)")
+
+
+def migrate_v7(conn):
+    """GPay reconciliation: transaction id lookups and one persisted status per order."""
+    conn.execute("CREATE INDEX idx_orders_txn_id ON orders(txn_id)")
+    conn.execute("""CREATE TABLE reconciliation (
+                        order_id INTEGER PRIMARY KEY REFERENCES orders(id) ON DELETE CASCADE,
+                        status TEXT NOT NULL,
+                        statement_amount INTEGER,
+                        reconciled_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now')))""")
+
+
+def migrate_v8(conn):
+    """Per-product stock. Products without a row are not tracked and never run out."""
+    conn.execute("""CREATE TABLE stock (
+                        product_id INTEGER PRIMARY KEY REFERENCES products(id),
+                        quantity INTEGER NOT NULL CHECK (quantity >= 0))""")
+    conn.execute("INSERT INTO meta (key, value) VALUES ('stock_version', 0)")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(f"""CREATE TRIGGER stock_{event.lower()}_version AFTER {event} ON stock
+                         BEGIN UPDATE meta SET value = value + 1 WHERE key = 'stock_version'; END""")
+
+
+def migrate_v9(conn):
+    """Delivery zone per order and a dispatch mark, with an index over the undispatched ones."""
+    conn.execute("ALTER TABLE orders ADD COLUMN zone TEXT")
+    conn.execute("ALTER TABLE orders ADD COLUMN dispatched_at TEXT")
+    pincodes = [row[0] for row in conn.execute("SELECT DISTINCT pincode FROM orders")]
+    conn.executemany("UPDATE orders SET zone = ? WHERE pincode = ?",
+                     [(zone_for(pin).zone, pin) for pin in pincodes if zone_for(pin)])
+    # Orders from before dispatch tracking are treated as already delivered
+    conn.execute("UPDATE orders SET dispatched_at = COALESCE(created_at, strftime('%Y-%m-%d %H:%M:%S', 'now'))")
+    conn.execute("CREATE INDEX idx_orders_pending ON orders(zone, id) WHERE dispatched_at IS NULL")
+
+
+def migrate_v10(conn):
+    """Store transaction ids normalized, so idx_orders_txn_id finds ids typed in another case."""
+    conn.execute("""UPDATE orders SET txn_id = UPPER(TRIM(txn_id, ' ' || char(9, 10, 13)))
+                     WHERE txn_id IS NOT NULL AND txn_id != UPPER(TRIM(txn_id, ' ' || char(9, 10, 13)))""")
+
+
+MIGRATIONS = {
+    1: migrate_v1,
+    2: migrate_v2,
+    3: migrate_v3,
+    4: migrate_v4,
+    5: migrate_v5,
+    6: migrate_v6,
+    7: migrate_v7,
+    8: migrate_v8,
+    9: migrate_v9,
+    10: migrate_v10,
+}
+SCHEMA_VERSION = max(MIGRATIONS)
+
+
+class OrderStore:
+    def __init__(self, path=DB_FILE, pool_size=4, timeout=10.0):
+        self.path = path
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        self.init_db()
+
+    def _connect(self):
+        # isolation_level=None: transactions are opened explicitly below, so
+        # writers can take the lock up front with BEGIN IMMEDIATE.
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                               check_same_thread=False, cached_statements=64)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def init_db(self):
+        with self.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for target in range(version + 1, SCHEMA_VERSION + 1):
+                MIGRATIONS[target](conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+
+    def save_order(self, order):
+        with self.transaction() as conn:
+            return insert_order(conn, order)
+
+    def order_id_for_key(self, order_key):
+        with self.connection() as conn:
+            row = conn.execute(ORDER_KEY_EXISTS_SQL, (order_key,)).fetchone()
+        return row[0] if row else None
+
+    def catalog_version(self):
+        """Bumped by triggers on every products change; a cheap cache key."""
+        with self.connection() as conn:
+            return conn.execute(CATALOG_VERSION_SQL).fetchone()[0]
+
+    def order_receipt(self, order_id):
+        """``(order dict, [(product, qty, unit_price), ...])``, or ``(None, [])`` if unknown."""
+        with self.connection() as conn:
+            cur = conn.execute(RECEIPT_ORDER_SQL, (order_id,))
+            row = cur.fetchone()
+            if row is None:
+                return None, []
+            order = dict(zip((d[0] for d in cur.description), row))
+            return order, conn.execute(RECEIPT_ITEMS_SQL, (order_id,)).fetchall()
+
+    def order_ids_on(self, day):
+        """Ids of orders placed on ``day`` (a date, UTC), oldest first."""
+        start, end = day.isoformat(), (day + timedelta(days=1)).isoformat()
+        with self.connection() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT id FROM orders WHERE created_at >= ? AND created_at < ? ORDER BY id", (start, end))]
+
+    def dispatch_summary(self, up_to_id):
+        """Undispatched orders up to ``up_to_id``, grouped by zone.
+
+        Returns ``[(zone, orders, total, [(product, units), ...]), ...]``;
+        orders outside the delivery area have zone None.
+        """
+        with self.connection() as conn:
+            zones = conn.execute(DISPATCH_ZONES_SQL, (up_to_id,)).fetchall()
+            items = conn.execute(DISPATCH_ITEMS_SQL, (up_to_id,)).fetchall()
+        per_zone = {}
+        for zone, name, units in items:
+            per_zone.setdefault(zone, []).append((name, units))
+        return [(zone, count, total, per_zone.get(zone, [])) for zone, count, total in zones]
+
+    def pending_orders(self, zone, up_to_id):
+        """Undispatched orders in ``zone``, oldest first, for a delivery run."""
+        sql = (f"SELECT {ORDER_COLUMNS} FROM orders o WHERE o.dispatched_at IS NULL"
+               " AND o.zone IS ? AND o.id <= ? ORDER BY o.id")
+        with self.connection() as conn:
+            return conn.execute(sql, (zone, up_to_id)).fetchall()
+
+    def mark_dispatched(self, zone, up_to_id):
+        """Mark the zone's undispatched orders up to ``up_to_id`` as sent out."""
+        with self.transaction() as conn:
+            return conn.execute(MARK_DISPATCHED_SQL, (zone, up_to_id)).rowcount
+
+    def stock_version(self):
+        """Bumped by triggers on every stock change, including each sale."""
+        with self.connection() as conn:
+            return conn.execute(STOCK_VERSION_SQL).fetchone()[0]
+
+    def stock_levels(self):
+        """``{product_id: units left}`` for tracked products."""
+        with self.connection() as conn:
+            return dict(conn.execute(SELECT_STOCK_SQL).fetchall())
+
+    def set_stock(self, levels):
+        """Set units left per product; ``None`` stops tracking that product."""
+        with self.transaction() as conn:
+            conn.executemany("DELETE FROM stock WHERE product_id = ?",
+                             [(pid,) for pid, qty in levels.items() if qty is None])
+            conn.executemany(SET_STOCK_SQL, [(pid, qty) for pid, qty in levels.items() if qty is not None])
+
+    def list_products(self):
+        with self.connection() as conn:
+            rows = conn.execute(SELECT_CATALOG_SQL).fetchall()
+        return [{"id": pid, "name": name, "price": price, "images": [image] if image else []}
+                for pid, name, price, image in rows]
+
+    def orders_page(self, filters=OrderFilters(), before_id=None, limit=50):
+        """Newest-first page of orders matching ``filters``.
+
+        Keyset pagination: pass the smallest id of the previous page as
+        ``before_id`` so each page is an index range scan, not an OFFSET.
+        """
+        where, params = filters.where()
+        if before_id is not None:
+            where += " AND o.id < ?"
+            params.append(before_id)
+        sql = f"SELECT {ORDER_COLUMNS} FROM orders o WHERE {where} ORDER BY o.id DESC LIMIT ?"
+        with self.connection() as conn:
+            return conn.execute(sql, (*params, limit)).fetchall()
+
+    def iter_orders(self, filters=OrderFilters(), batch_size=1000):
+        """Yield oldest-first batches of matching orders plus their total.
+
+        Rows come off the cursor ``batch_size`` at a time, so an export of
+        any size holds at most one batch in memory.  The pooled connection
+        is held until the generator is exhausted or closed.
+        """
+        where, params = filters.where()
+        sql = f"SELECT {ORDER_COLUMNS}, o.total FROM orders o WHERE {where} ORDER BY o.id"
+        with self.connection() as conn:
+            cur = conn.execute(sql, params)
+            try:
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cur.close()
+
+    def count_orders(self, filters=OrderFilters()):
+        where, params = filters.where()
+        with self.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM orders o WHERE {where}", params).fetchone()[0]
+
+    def latest_order_id(self):
+        """Cheap data version for cache keys: changes whenever an order is added."""
+        with self.connection() as conn:
+            return conn.execute("SELECT MAX(id) FROM orders").fetchone()[0] or 0
+
+    def sales_summary(self, days=90, top_pincodes=10):
+        """Precomputed sales figures for the admin charts.
+
+        Reads only the summary tables kept up to date by ``insert_order``,
+        so the cost does not grow with the number of orders.
+        """
+        with self.connection() as conn:
+            return {
+                "daily": conn.execute(SALES_BY_DAY_SQL, (f"-{days} days",)).fetchall(),
+                "products": conn.execute(SALES_BY_PRODUCT_SQL).fetchall(),
+                "payments": conn.execute(SALES_BY_PAYMENT_SQL).fetchall(),
+                "pincodes": conn.execute(SALES_BY_PINCODE_SQL, (top_pincodes,)).fetchall(),
+            }
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+if __name__ == "__main__":
+    # One-shot upgrade of an existing database: python order_store.py [orders.db]
+    store = OrderStore(sys.argv[1] if len(sys.argv) > 1 else DB_FILE)
+    with store.connection() as conn:
+        count = conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+    print(f"{store.path}: schema v{SCHEMA_VERSION}, {count} orders")
+    store.close()
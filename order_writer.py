@@ -0,0 +1,150 @@
+"""Write-behind order persistence with group commit and a replay journal.
+
+Sessions hand orders to ``OrderWriter.submit``, which appends them to a
+local journal and queues them.  One thread drains the queue and commits
+up to ``max_batch`` orders per transaction, resolving each order's future
+with its id once the commit is done.  Orders still in the journal when
+the process dies are replayed into the database on the next start.
+
+An order that is turned down (out of stock, bad data) gets a tombstone
+line in the journal so replay never resurrects it; a journaled order that
+fails on replay is logged and appended to ``<journal>.rejected`` instead.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import uuid
+from concurrent.futures import Future
+
+from order_store import OutOfStock, insert_order
+
+log = logging.getLogger(__name__)
+
+
+class OrderWriter:
+    def __init__(self, store, journal_path, max_queue=1000, max_batch=32):
+        self.store = store
+        self.journal_path = journal_path
+        self.rejected_path = journal_path + ".rejected"
+        self.max_batch = max_batch
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()  # guards the journal file and _pending
+        self._pending = 0
+        self.replay()
+        self._journal = open(journal_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="order-writer", daemon=True)
+        self._thread.start()
+
+    # ------------------ SUBMIT ------------------
+    def submit(self, order, timeout=5.0):
+        """Journal and queue ``order``; the returned future resolves to its id.
+
+        Raises ``queue.Full`` if the writer is more than ``max_queue`` orders
+        behind for ``timeout`` seconds.
+        """
+        order = dict(order)
+        order.setdefault("order_key", uuid.uuid4().hex)
+        future = Future()
+        with self._lock:
+            # Flushed to the OS before queuing: a crash of this process after
+            # this point is covered by replay().
+            self._journal.write(json.dumps(order) + "\n")
+            self._journal.flush()
+            self._pending += 1
+        try:
+            self._queue.put((order, future), timeout=timeout)
+        except queue.Full:
+            # The shopper is asked to retry, so the journaled copy must not be replayed
+            self._tombstone(order["order_key"])
+            with self._lock:
+                self._pending -= 1
+            raise
+        return future
+
+    # ------------------ WRITER THREAD ------------------
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit(self, batch):
+        try:
+            with self.store.transaction() as conn:
+                ids = [insert_order(conn, order) for order, _ in batch]
+        except Exception as e:
+            # One bad order must not fail the rest of the group.
+            if len(batch) > 1:
+                for entry in batch:
+                    self._commit([entry])
+                return
+            order, future = batch[0]
+            self._tombstone(order["order_key"])
+            if isinstance(e, OutOfStock):
+                future.set_exception(e)
+                return
+            log.exception("order %s could not be saved", order["order_key"])
+            future.set_exception(RuntimeError("order could not be saved"))
+            return
+        for (_, future), order_id in zip(batch, ids):
+            future.set_result(order_id)
+
+    def _tombstone(self, order_key):
+        # The caller is told the order failed, so replay() must not insert it later
+        with self._lock:
+            self._journal.write(json.dumps({"order_key": order_key, "rejected": True}) + "\n")
+            self._journal.flush()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            self._commit(batch)
+            with self._lock:
+                self._pending -= len(batch)
+                if self._pending == 0:
+                    # Everything journaled is committed: start a fresh journal.
+                    self._journal.seek(0)
+                    self._journal.truncate()
+
+    # ------------------ RECOVERY ------------------
+    def replay(self):
+        """Insert journaled orders that never reached the database, then clear the journal.
+
+        Never raises for a bad entry: it is logged and moved to ``rejected_path``.
+        """
+        if not os.path.exists(self.journal_path):
+            return 0
+        orders = {}  # order_key -> order; a tombstone drops the entries before it
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn final line from a crash mid-write
+                if entry.get("rejected"):
+                    orders.pop(entry["order_key"], None)
+                else:
+                    orders[entry["order_key"]] = entry
+        replayed = 0
+        for order in orders.values():
+            if self.store.order_id_for_key(order["order_key"]) is not None:
+                continue
+            try:
+                with self.store.transaction() as conn:
+                    insert_order(conn, order)
+            except Exception:
+                log.exception("journaled order %s could not be replayed; moved to %s",
+                              order["order_key"], self.rejected_path)
+                with open(self.rejected_path, "a", encoding="utf-8") as dead:
+                    dead.write(json.dumps(order) + "\n")
+                continue
+            replayed += 1
+        os.remove(self.journal_path)
+        if replayed:
+            log.warning("replayed %d journaled orders from %s", replayed, self.journal_path)
+        return replayed
@@ -0,0 +1,77 @@
+"""Opt-in timing of named sections with rolling p50/p95 per process.
+
+Enable with ``SMC_PERF=1``; add ``SMC_PERF_LOG=perf.jsonl`` to also append
+every sample as a JSON line for offline analysis.  When disabled,
+``section()`` is a shared no-op context manager.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+ENABLED = os.environ.get("SMC_PERF") == "1"
+LOG_PATH = os.environ.get("SMC_PERF_LOG")
+WINDOW = 500  # samples kept per section
+
+_IMPORTED_AT = time.perf_counter()
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))
+_lock = threading.Lock()
+_log = None
+_cold_start_recorded = False
+_NOOP = nullcontext()
+
+
+def record(name, seconds):
+    global _log
+    if not ENABLED:
+        return
+    with _lock:
+        _samples[name].append(seconds)
+        if LOG_PATH:
+            if _log is None:
+                _log = open(LOG_PATH, "a", buffering=1, encoding="utf-8")
+            _log.write(json.dumps({"ts": round(time.time(), 3), "section": name,
+                                   "ms": round(seconds * 1000, 3)}) + "\n")
+
+
+@contextmanager
+def _timed(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def section(name):
+    """``with perf.section("save_order"): ...``"""
+    return _timed(name) if ENABLED else _NOOP
+
+
+def cold_start_done():
+    """Record import-to-first-rendered-page once per process."""
+    global _cold_start_recorded
+    if ENABLED and not _cold_start_recorded:
+        _cold_start_recorded = True
+        record("cold_start", time.perf_counter() - _IMPORTED_AT)
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def stats():
+    """``{section: {"count", "p50_ms", "p95_ms", "max_ms"}}`` over the rolling window."""
+    with _lock:
+        snapshot = {name: sorted(samples) for name, samples in _samples.items()}
+    return {
+        name: {
+            "count": len(ordered),
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+        for name, ordered in sorted(snapshot.items()) if ordered
+    }
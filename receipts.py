@@ -0,0 +1,107 @@
+"""Order receipts rendered in a background pool and kept on disk by order id.
+
+``ReceiptRenderer.submit`` returns at once; a worker thread reads the
+order, draws it with PIL and writes ``<order_id>.png`` and ``<order_id>.pdf``
+into ``receipts/``.  A receipt already on disk is never drawn again, and
+an order that is being drawn is not queued twice.
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+RECEIPT_DIR = "receipts"
+FORMATS = {"png": "image/png", "pdf": "application/pdf"}
+
+WIDTH = 800
+MARGIN = 40
+LINE_PX = 30
+SHOP_NAME = "SMC STORE"
+SHOP_LINE = "SMC College | GPay 89407 39291"
+
+
+def _lines(order, items):
+    """The receipt as ``(text, amount, is_heading)`` rows; prices in whole rupees."""
+    rows = [(SHOP_NAME, "", True), (SHOP_LINE, "", False), ("", "", False),
+            (f"Receipt for order #{order['id']}", "", True),
+            (f"Placed: {order['created_at'] or '-'} UTC", "", False),
+            (f"{order['name']} | {order['phone']}", "", False),
+            (f"{order['address']} - {order['pincode']}", "", False),
+            ("", "", False)]
+    rows += [(f"{name} x {qty} @ Rs. {price}", f"Rs. {qty * price}", False) for name, qty, price in items]
+    payment = order["payment"] + (f" (txn {order['txn_id']})" if order["payment"] == "GPay" else "")
+    rows += [("", "", False), ("Total", f"Rs. {order['total']}", True), (f"Payment: {payment}", "", False)]
+    return rows
+
+
+def _font(size):
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 only has the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def render(order, items, png_path, pdf_path):
+    """Draw one receipt to PNG and PDF, each written atomically."""
+    from PIL import Image, ImageDraw  # only the worker threads need PIL
+
+    rows = _lines(order, items)
+    body, heading = _font(18), _font(24)
+    im = Image.new("RGB", (WIDTH, 2 * MARGIN + LINE_PX * len(rows)), "white")
+    draw = ImageDraw.Draw(im)
+    for i, (text, amount, is_heading) in enumerate(rows):
+        font, fill, y = (heading if is_heading else body), ("#1b5e20" if is_heading else "black"), MARGIN + i * LINE_PX
+        draw.text((MARGIN, y), text, fill=fill, font=font)
+        if amount:
+            draw.text((WIDTH - MARGIN - draw.textlength(amount, font=font), y), amount, fill=fill, font=font)
+    for path, fmt in ((png_path, "PNG"), (pdf_path, "PDF")):
+        tmp = path + ".part"
+        im.save(tmp, fmt)
+        os.replace(tmp, path)
+
+
+class ReceiptRenderer:
+    def __init__(self, store, out_dir=RECEIPT_DIR, workers=2):
+        self.store = store
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="receipts")
+        self._lock = threading.Lock()
+        self._inflight = {}  # order id -> Future
+
+    def path(self, order_id, fmt="pdf"):
+        return os.path.join(self.out_dir, f"{order_id}.{fmt}")
+
+    def ready(self, order_id):
+        # The PDF is written last, so it existing means both files are there
+        return os.path.exists(self.path(order_id, "pdf"))
+
+    def submit(self, order_id):
+        """Queue ``order_id`` for rendering; the future resolves to the PDF path."""
+        if self.ready(order_id):
+            done = Future()
+            done.set_result(self.path(order_id))
+            return done
+        with self._lock:
+            future = self._inflight.get(order_id)
+            if future is not None:
+                return future
+            future = self._inflight[order_id] = self._pool.submit(self._render, order_id)
+        # Outside the lock: the callback runs right here if the job already finished
+        future.add_done_callback(lambda _: self._forget(order_id))
+        return future
+
+    def submit_many(self, order_ids):
+        return [self.submit(order_id) for order_id in order_ids]
+
+    def _forget(self, order_id):
+        with self._lock:
+            self._inflight.pop(order_id, None)
+
+    def _render(self, order_id):
+        order, items = self.store.order_receipt(order_id)
+        if order is None:
+            raise KeyError(f"no order {order_id}")
+        render(order, items, self.path(order_id, "png"), self.path(order_id, "pdf"))
+        return self.path(order_id)
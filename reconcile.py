@@ -0,0 +1,128 @@
+"""Match GPay orders against a UPI/bank statement export.
+
+The statement CSV is read in one streaming pass into a hash table keyed by
+transaction id (UTR), then every GPay order in scope probes it.  Each
+order gets one persisted status:
+
+* ``matched``: the transaction is on the statement for the order total.
+* ``amount_mismatch``: the transaction is on the statement for another amount.
+* ``duplicate_txn``: more than one order claims the same transaction id.
+* ``missing``: the transaction id is not on the statement.
+"""
+import csv
+import io
+from collections import Counter
+from typing import NamedTuple
+
+from order_store import normalize_txn
+
+STATUSES = ("matched", "amount_mismatch", "duplicate_txn", "missing")
+
+# Header names banks and UPI apps use, matched case-insensitively by prefix
+TXN_HEADERS = ("utr", "upi ref", "upi transaction id", "transaction id", "txn id", "reference", "ref no")
+AMOUNT_HEADERS = ("amount", "credit", "deposit")
+
+GPAY_ORDERS_SQL = """SELECT o.id, o.txn_id, o.total FROM orders o
+                      WHERE o.payment = 'GPay' AND {where} ORDER BY o.id"""
+
+DUPLICATE_TXNS_SQL = """SELECT txn_id FROM orders WHERE txn_id IN ({marks}) AND payment = 'GPay'
+                         GROUP BY txn_id HAVING COUNT(*) > 1"""
+
+SAVE_STATUS_SQL = """INSERT INTO reconciliation (order_id, status, statement_amount, reconciled_at)
+                     VALUES (?, ?, ?, strftime('%Y-%m-%d %H:%M:%S', 'now'))
+                     ON CONFLICT (order_id) DO UPDATE SET status = excluded.status,
+                         statement_amount = excluded.statement_amount,
+                         reconciled_at = excluded.reconciled_at"""
+
+ISSUES_SQL = """SELECT o.id, o.created_at, o.name, o.phone, o.txn_id, o.total, r.status, r.statement_amount
+                  FROM reconciliation r JOIN orders o ON o.id = r.order_id
+                 WHERE r.status != 'matched' AND {where} ORDER BY o.id DESC LIMIT ?"""
+
+
+class StatementError(ValueError):
+    """The statement has no recognisable transaction id or amount column."""
+
+
+class Result(NamedTuple):
+    counts: Counter
+    statement_lines: int
+    unclaimed: int  # statement credits no order in scope points at
+
+
+def parse_amount(value):
+    text = (value or "").replace(",", "").replace("₹", "").replace("INR", "").strip()
+    try:
+        return round(float(text), 2)
+    except ValueError:
+        return None
+
+
+def _find_column(fieldnames, prefixes):
+    for name in fieldnames:
+        if name and name.strip().lower().startswith(prefixes):
+            return name
+    return None
+
+
+def read_statement(fileobj):
+    """Stream ``(txn_id, amount)`` pairs from a binary statement CSV."""
+    reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+    txn_col = _find_column(reader.fieldnames or (), TXN_HEADERS)
+    amount_col = _find_column(reader.fieldnames or (), AMOUNT_HEADERS)
+    if txn_col is None or amount_col is None:
+        raise StatementError("The statement needs a transaction id (UTR) column and an amount column.")
+    for row in reader:
+        txn = normalize_txn(row[txn_col])
+        if txn:
+            yield txn, parse_amount(row[amount_col])
+
+
+def reconcile(store, statement, filters, batch_size=1000):
+    """Reconcile GPay orders matching ``filters`` against ``statement`` and save the statuses."""
+    # Build side: the statement, hashed on transaction id
+    credits, lines = {}, 0
+    for txn, amount in read_statement(statement):
+        lines += 1
+        credits[txn] = (credits.get(txn) or 0) + (amount or 0)
+
+    where, params = filters.where()
+    counts, claimed = Counter(), set()
+    with store.connection() as conn:
+        cur = conn.execute(GPAY_ORDERS_SQL.format(where=where), params)
+        while True:
+            orders = cur.fetchmany(batch_size)
+            if not orders:
+                break
+            # Probe side: each order looks up its transaction id in the
+            # statement; the txn_id index finds ids shared by other orders.
+            # Ids are stored normalized, so both sides compare the same form.
+            txns = list({normalize_txn(txn) for _, txn, _ in orders if txn})
+            duplicates = {t for (t,) in conn.execute(
+                DUPLICATE_TXNS_SQL.format(marks=",".join("?" * len(txns))), txns)} if txns else set()
+            statuses = []
+            for order_id, txn, total in orders:
+                txn = normalize_txn(txn)
+                amount = credits.get(txn)
+                if txn in duplicates:
+                    status = "duplicate_txn"
+                elif amount is None:
+                    status = "missing"
+                elif round(amount) == total:
+                    status = "matched"
+                else:
+                    status = "amount_mismatch"
+                if amount is not None:
+                    claimed.add(txn)
+                counts[status] += 1
+                statuses.append((order_id, status, amount))
+            # A short write per batch, so checkouts are never held up for long
+            with store.transaction() as write:
+                write.executemany(SAVE_STATUS_SQL, statuses)
+    return Result(counts, lines, len(credits.keys() - claimed))
+
+
+def issues(store, filters, limit=500):
+    """Reconciled orders that did not match, newest first."""
+    where, params = filters.where()
+    with store.connection() as conn:
+        return conn.execute(ISSUES_SQL.format(where=where), (*params, limit)).fetchall()
@@ -0,0 +1,55 @@
+"""PNG charts for the admin analytics panel, drawn from ``OrderStore.sales_summary``.
+
+Rendered once per data version by the admin page and cached as bytes, so
+matplotlib is imported and run only when an order has come in since.
+"""
+import io
+
+GREEN = "#2e7d32"
+PALETTE = ("#2e7d32", "#66bb6a", "#a5d6a7", "#c8e6c9")
+
+
+def _png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=100, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def render(summary):
+    """Return ``{title: png_bytes}`` for each non-empty part of ``summary``."""
+    # admin-only and slow to import; keeps matplotlib off every other page
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+
+    charts = {}
+    if summary["daily"]:
+        days, _, revenue = zip(*summary["daily"])
+        fig = Figure(figsize=(8, 3))
+        ax = fig.subplots()
+        ax.bar(days, revenue, color=GREEN)
+        ax.set_ylabel("₹")
+        step = max(1, len(days) // 10)
+        ax.set_xticks(range(0, len(days), step), days[::step], rotation=45, ha="right")
+        charts["Revenue per day"] = _png(fig)
+    if summary["products"]:
+        names, units, _ = zip(*summary["products"])
+        fig = Figure(figsize=(8, 3))
+        ax = fig.subplots()
+        ax.barh(names[::-1], units[::-1], color=GREEN)
+        ax.set_xlabel("Units sold")
+        charts["Units per product"] = _png(fig)
+    if summary["payments"]:
+        methods, orders, _ = zip(*summary["payments"])
+        fig = Figure(figsize=(4, 3))
+        ax = fig.subplots()
+        ax.pie(orders, labels=methods, autopct="%1.0f%%", colors=PALETTE)
+        charts["Payment methods"] = _png(fig)
+    if summary["pincodes"]:
+        pincodes, orders, _ = zip(*summary["pincodes"])
+        fig = Figure(figsize=(4, 3))
+        ax = fig.subplots()
+        ax.barh(pincodes[::-1], orders[::-1], color=GREEN)
+        ax.set_xlabel("Orders")
+        charts["Top pincodes"] = _png(fig)
+    return charts
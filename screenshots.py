@@ -0,0 +1,95 @@
+"""Payment screenshot storage and the admin dashboard's screenshot helpers."""
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+
+THUMBNAIL_PX = 160
+
+UPLOAD_DIR = "screenshots"
+# Keep in step with server.maxUploadSize in .streamlit/config.toml, which
+# makes Streamlit refuse larger uploads before buffering them.
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+
+SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png", "png"),
+    (b"\xff\xd8\xff", "image/jpeg", "jpg"),
+)
+
+
+class UploadRejected(ValueError):
+    """The upload is too large or is not a PNG/JPEG image."""
+
+
+def store_upload(fileobj, size=None, upload_dir=UPLOAD_DIR, max_bytes=MAX_UPLOAD_BYTES):
+    """Copy an uploaded screenshot to disk in chunks, named by its SHA-256.
+
+    Identical uploads (a shopper retrying, two tabs) map to the same file,
+    and two customers' ``screenshot.jpg`` can no longer overwrite each
+    other.  Returns ``{"path", "sha256", "size", "mime"}``.
+    """
+    if size is not None and size > max_bytes:
+        raise UploadRejected(f"Screenshot is larger than {max_bytes // (1024 * 1024)} MB.")
+    head = fileobj.read(8)
+    kind = next(((mime, ext) for sig, mime, ext in SIGNATURES if head.startswith(sig)), None)
+    if kind is None:
+        raise UploadRejected("Screenshot must be a PNG or JPEG image.")
+    mime, ext = kind
+
+    os.makedirs(upload_dir, exist_ok=True)
+    digest = hashlib.sha256(head)
+    written = len(head)
+    fd, tmp = tempfile.mkstemp(dir=upload_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(head)
+            for chunk in iter(lambda: fileobj.read(CHUNK_BYTES), b""):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadRejected(f"Screenshot is larger than {max_bytes // (1024 * 1024)} MB.")
+                digest.update(chunk)
+                out.write(chunk)
+        sha256 = digest.hexdigest()
+        path = os.path.join(upload_dir, f"{sha256}.{ext}")
+        if os.path.exists(path):
+            os.remove(tmp)
+        else:
+            os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return {"path": path, "sha256": sha256, "size": written, "mime": mime}
+
+
+def existing_path(path):
+    """The screenshot path stored on an order, or None if there is no file."""
+    if not path or path == "N/A" or not os.path.exists(path):
+        return None
+    return path
+
+
+def thumbnail(path, max_px=THUMBNAIL_PX):
+    """A small JPEG preview; the full image is never sent to the browser."""
+    from PIL import Image  # admin-only; keeps PIL off the checkout path
+
+    with Image.open(path) as im:
+        im.draft("RGB", (max_px, max_px))  # lets the JPEG decoder skip detail
+        im.thumbnail((max_px, max_px))
+        buf = io.BytesIO()
+        im.convert("RGB").save(buf, "JPEG", quality=70, optimize=True)
+    return buf.getvalue()
+
+
+def zip_files(files, path):
+    """Write ``(order_id, path)`` pairs into a ZIP at ``path``.
+
+    Screenshots are already compressed, so entries are stored as-is and
+    ``ZipFile.write`` copies each file in chunks rather than reading it whole.
+    """
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+        for order_id, src in files:
+            zf.write(src, arcname=f"order-{order_id}-{os.path.basename(src)}")
+    return path
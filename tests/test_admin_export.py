@@ -0,0 +1,61 @@
+"""The admin "Export orders" expander, driven end to end with AppTest."""
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import downloads  # noqa: E402
+import order_export  # noqa: E402
+from conftest import ROOT  # noqa: E402
+from order_store import OrderStore, insert_order  # noqa: E402
+
+APP = os.path.join(ROOT, "green app.py")
+
+
+def seed(path, count):
+    store = OrderStore(path, pool_size=1)
+    try:
+        product = store.list_products()[0]
+        with store.transaction() as conn:
+            for n in range(count):
+                insert_order(conn, {
+                    "name": f"Shopper {n}", "address": "1 Beach Road", "phone": f"9{n:09d}",
+                    "pincode": "628001", "payment": "Cash on Delivery", "transaction": "N/A",
+                    "gpay_number": "N/A", "screenshot": "N/A", "items": [dict(product, qty=1)],
+                })
+    finally:
+        store.close()
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    import streamlit as st
+
+    monkeypatch.chdir(ROOT)  # images and assets are referenced relative to the repo
+    monkeypatch.delenv("SMC_LOTTIE_REFRESH", raising=False)
+    monkeypatch.setenv("SMC_DB_FILE", str(tmp_path / "orders.db"))
+    monkeypatch.setattr(downloads, "DOWNLOAD_DIR", str(tmp_path / "downloads"))
+    seed(os.environ["SMC_DB_FILE"], 3)
+    st.cache_resource.clear()  # drop stores opened on another test's database
+    st.cache_data.clear()
+    yield AppTest.from_file(APP, default_timeout=60)
+    st.cache_resource.clear()
+
+
+def test_export_csv_is_published_as_a_link(app):
+    app.run()
+    app.text_input[0].input("admin")
+    app.text_input[1].input("smctuty")
+    next(b for b in app.button if b.label == "Sign In").click().run()
+    next(b for b in app.button if b.label == "Prepare export").click().run()
+    assert not app.exception
+
+    link = next(m.value for m in app.markdown if downloads.URL_PREFIX in m.value)
+    assert 'download="orders.csv"' in link
+    (folder,) = os.listdir(downloads.DOWNLOAD_DIR)
+    with open(os.path.join(downloads.DOWNLOAD_DIR, folder, "orders.csv"), encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == ",".join(order_export.COLUMNS)
+    assert len(lines) == 4
@@ -0,0 +1,83 @@
+"""OrderStore: migrating the pre-versioning table, and stock reservation under contention."""
+import sqlite3
+import threading
+
+from order_store import SCHEMA_VERSION, OrderFilters, OrderStore, OutOfStock, insert_order
+
+LEGACY_SCHEMA = """CREATE TABLE orders
+                   (name TEXT, address TEXT, phone TEXT, pincode TEXT,
+                    payment TEXT, gpay_number TEXT, txn_id TEXT,
+                    items TEXT, screenshot TEXT)"""
+
+
+def legacy_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(LEGACY_SCHEMA)
+    conn.executemany("INSERT INTO orders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def legacy_row(name, items):
+    return (name, "1 Beach Road", "9000000000", "628001", "Cash on Delivery", "N/A", "N/A", items, "N/A")
+
+
+def test_migrates_legacy_orders(tmp_path):
+    path = str(tmp_path / "orders.db")
+    amla, ragi, soap = ({"name": "Dry amla", "price": 100}, {"name": "Ragi powder", "price": 100},
+                        {"name": "Old soap", "price": 45})
+    legacy_db(path, [legacy_row("Duplicates", str([amla, amla, ragi, soap])),
+                     legacy_row("Garbled", "[{'name': 'Dry amla', 'price'"),
+                     legacy_row("Empty", None)])
+
+    store = OrderStore(path, pool_size=1)
+    with store.connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'orders_legacy'").fetchone() is None
+        orders = conn.execute("SELECT name, total FROM orders ORDER BY id").fetchall()
+        items = conn.execute("""SELECT o.name, p.name, i.quantity, i.unit_price
+                                  FROM order_items i JOIN orders o ON o.id = i.order_id
+                                  JOIN products p ON p.id = i.product_id
+                                 ORDER BY i.id""").fetchall()
+        products = dict(conn.execute("SELECT name, id FROM products").fetchall())
+        item_products = {row[0] for row in conn.execute("SELECT product_id FROM order_items")}
+    store.close()
+
+    assert orders == [("Duplicates", 345), ("Garbled", 0), ("Empty", 0)]
+    assert items == [("Duplicates", "Dry amla", 2, 100), ("Duplicates", "Ragi powder", 1, 100),
+                     ("Duplicates", "Old soap", 1, 45)]
+    # Cart lines point at the one catalog row per product name
+    assert item_products == {products["Dry amla"], products["Ragi powder"], products["Old soap"]}
+
+
+def test_last_unit_goes_to_exactly_one_order(tmp_path):
+    store = OrderStore(str(tmp_path / "orders.db"), pool_size=2)
+    product = store.list_products()[0]
+    store.set_stock({product["id"]: 1})
+    start = threading.Barrier(2)
+    outcomes = []
+
+    def checkout(n):
+        order = {"name": f"Shopper {n}", "address": "1 Beach Road", "phone": "9000000000",
+                 "pincode": "628001", "payment": "Cash on Delivery", "transaction": "N/A",
+                 "gpay_number": "N/A", "screenshot": "N/A", "items": [dict(product, qty=1)]}
+        start.wait()
+        try:
+            with store.transaction() as conn:
+                outcomes.append(insert_order(conn, order))
+        except OutOfStock as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=checkout, args=(n,)) for n in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(type(o).__name__ for o in outcomes) == ["OutOfStock", "int"]
+    assert store.stock_levels() == {product["id"]: 0}
+    # The losing order was rolled back with its reservation attempt
+    assert store.count_orders(OrderFilters()) == 1
+    with store.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM order_items").fetchone()[0] == 1
+    store.close()
@@ -0,0 +1,137 @@
+"""OrderWriter: journal replay, the group-commit fallback and journal truncation."""
+import json
+import queue
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from order_store import OrderFilters, OrderStore, OutOfStock, insert_order
+from order_writer import OrderWriter
+
+
+class GatedStore(OrderStore):
+    """Holds the writer thread's first transaction until ``gate`` is set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    @contextmanager
+    def transaction(self):
+        if threading.current_thread().name == "order-writer":
+            self.entered.set()
+            assert self.gate.wait(5)
+        with super().transaction() as conn:
+            yield conn
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = GatedStore(str(tmp_path / "orders.db"), pool_size=2)
+    store.gate.set()
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return str(tmp_path / "orders.db.journal")
+
+
+def order(store, key, product=0):
+    return {"name": "Shopper", "address": "1 Beach Road", "phone": "9000000000", "pincode": "628001",
+            "payment": "Cash on Delivery", "transaction": "N/A", "gpay_number": "N/A",
+            "screenshot": "N/A", "order_key": key,
+            "items": [dict(store.list_products()[product], qty=1)]}
+
+
+def write_journal(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(entry if isinstance(entry, str) else json.dumps(entry) + "\n")
+
+
+def wait_until(check, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_replay_inserts_missing_orders_and_removes_journal(store, journal):
+    with store.transaction() as conn:
+        insert_order(conn, order(store, "saved"))
+    write_journal(journal, [order(store, "saved"), order(store, "lost"), '{"name": "tor'])
+
+    writer = OrderWriter(store, journal)
+
+    assert store.order_id_for_key("lost") is not None
+    assert store.count_orders(OrderFilters()) == 2
+    assert writer._journal.tell() == 0  # a fresh journal was started
+
+
+def test_replay_moves_a_failing_entry_aside(store, journal):
+    store.set_stock({store.list_products()[0]["id"]: 0})
+    write_journal(journal, [order(store, "sold-out"), order(store, "fine", product=1)])
+
+    writer = OrderWriter(store, journal)  # must not raise
+
+    assert store.order_id_for_key("sold-out") is None
+    assert store.order_id_for_key("fine") is not None
+    with open(writer.rejected_path, encoding="utf-8") as f:
+        assert [json.loads(line)["order_key"] for line in f] == ["sold-out"]
+
+
+def test_replay_skips_tombstoned_orders_but_not_a_later_retry(store, journal):
+    write_journal(journal, [order(store, "dropped"), {"order_key": "dropped", "rejected": True},
+                            order(store, "retried"), {"order_key": "retried", "rejected": True},
+                            order(store, "retried")])
+
+    OrderWriter(store, journal)
+
+    assert store.order_id_for_key("dropped") is None
+    assert store.order_id_for_key("retried") is not None
+
+
+def test_group_commit_isolates_a_bad_order_and_truncates_the_journal(store, journal):
+    store.set_stock({store.list_products()[1]["id"]: 0})
+    store.gate.clear()
+    writer = OrderWriter(store, journal)
+    first = writer.submit(order(store, "first"))
+    assert store.entered.wait(5)
+    # Queued behind the held transaction, so these three commit as one group
+    good = writer.submit(order(store, "good"))
+    bad = writer.submit(order(store, "bad", product=1))
+    also_good = writer.submit(order(store, "also-good"))
+    store.gate.set()
+
+    assert len({first.result(5), good.result(5), also_good.result(5)}) == 3
+    with pytest.raises(OutOfStock):
+        bad.result(5)
+    assert store.order_id_for_key("bad") is None
+    wait_until(lambda: writer._pending == 0)
+    assert writer._journal.tell() == 0
+
+
+def test_order_turned_away_when_queue_is_full_is_not_replayed(store, journal, tmp_path):
+    store.gate.clear()
+    writer = OrderWriter(store, journal, max_queue=1)
+    first = writer.submit(order(store, "first"))
+    assert store.entered.wait(5)
+    queued = writer.submit(order(store, "queued"))
+    with pytest.raises(queue.Full):
+        writer.submit(order(store, "turned-away"), timeout=0.01)
+    # What a crash right now would leave behind
+    crashed = str(tmp_path / "crashed.journal")
+    shutil.copy(journal, crashed)
+    store.gate.set()
+    first.result(5), queued.result(5)
+
+    OrderWriter(store, crashed)
+
+    assert store.order_id_for_key("turned-away") is None
+    assert store.count_orders(OrderFilters()) == 2
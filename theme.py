@@ -0,0 +1,22 @@
+"""The app stylesheet, read and minified once per process."""
+import functools
+import os
+import re
+
+THEME_CSS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "theme.css")
+
+
+def minify(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    # Spaces around these are never significant; a bare space between
+    # selectors (descendant combinator) is left alone.
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet(path=THEME_CSS):
+    """A single ``<style>`` tag for ``st.markdown(..., unsafe_allow_html=True)``."""
+    with open(path, encoding="utf-8") as f:
+        return f"<style>{minify(f.read())}</style>"
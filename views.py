@@ -0,0 +1,241 @@
+"""Shopper-facing UI units wrapped in ``st.fragment``.
+
+A click or edit inside one of these reruns only that function, not the
+whole script (stylesheet, banner, store setup and every image above it).
+Leaving the page goes through ``st.switch_page``, which reruns the full app.
+"""
+import queue
+import uuid
+
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+import core
+import perf
+import screenshots
+from admission import Busy
+from delivery_zones import zone_for
+from image_variants import variant
+from order_store import OutOfStock
+
+
+def add_to_cart(product):
+    # Button callback: over the click limit, flag a busy response instead of adding
+    if core.allow("cart"):
+        st.session_state.cart.add(product)
+    else:
+        st.session_state.rate_limited = True
+
+
+def rate_limited():
+    """Show the busy response in place of the fragment if the last click was over the limit."""
+    if st.session_state.pop("rate_limited", False):
+        core.busy()
+        return True
+    return False
+
+
+@st.fragment
+def product_list(products):
+    if rate_limited():
+        return
+    cart = st.session_state.cart
+    levels = core.stock()
+    for p in products:
+        st.subheader(f"{p['name']} - ₹{p['price']}")
+
+        # Show all images for that product
+        with perf.section("image_render"):
+            for img in p["images"]:
+                st.image(variant(img, "thumb"), width=150)
+
+        left = levels.get(p["id"])
+        sold_out = left is not None and left <= cart.quantity(p["id"])
+        if sold_out:
+            st.caption("Out of stock" if left == 0 else f"Only {left} left, all in your cart")
+        st.button(f"Add to Cart: {p['name']}", on_click=add_to_cart, args=(p,), disabled=sold_out)
+
+    if st.button(f"View Cart ({cart.count})"):
+        core.go("cart")
+
+
+@st.fragment
+def cart_summary():
+    if rate_limited():
+        return
+    cart = st.session_state.cart
+    if not cart:
+        st.warning("Cart is empty!")
+    else:
+        levels = core.stock()
+        for line in list(cart.lines.values()):
+            c1, c2, c3 = st.columns([4, 1, 1])
+            with c1:
+                st.write(f"✔️ {line['name']} - ₹{line['price']} × {line['qty']}")
+            with c2:
+                st.button("➖", key=f"dec_{line['id']}", on_click=cart.remove, args=(line["id"],))
+            with c3:
+                st.button("➕", key=f"inc_{line['id']}", on_click=add_to_cart, args=(line,),
+                          disabled=levels.get(line["id"], line["qty"] + 1) <= line["qty"])
+        st.success(f"Total: ₹{cart.total}")
+    if st.button("Place Order"):
+        core.go("order")
+
+
+@st.fragment
+def order_form(save_order, success_anim):
+    placed = st.session_state.get("placed_order")
+    if placed:
+        order_confirmation(placed, success_anim)
+        return
+    if not st.session_state.cart:
+        st.warning("Cart is empty!")
+        return
+    # One key per checkout: a second click or a replayed rerun submits the
+    # same key, and the store returns the first order instead of a copy.
+    if "checkout_key" not in st.session_state:
+        st.session_state.checkout_key = uuid.uuid4().hex
+
+    payment = st.radio("Choose Payment Method:", ["Cash on Delivery", "GPay"])
+    Name = st.text_input("Enter your name:")
+    address = st.text_area("Enter Delivery Address:")
+    phone = st.text_input("Enter your phone number:")
+    pincode = st.text_input("Enter your pincode")
+    zone = zone_for(pincode)
+    if pincode and zone is None:
+        st.error("⚠️ Sorry, we don't deliver to this pincode yet.")
+    elif zone:
+        st.caption(f"🚚 Delivery zone: {zone.zone}, {zone.district}")
+    txn = ""
+    file_path = None
+    shot = None
+
+    if payment == "GPay":
+        st.markdown("### 📱 Pay using GPay")
+        st.info("Send your payment to **GPay Number: 89407 39291**")
+        txn = st.text_input("Enter your GPay Transaction ID after payment:")
+        payment_screenshot = st.file_uploader("Upload GPay Payment Screenshot", type=["png","jpg","jpeg"])
+        if payment_screenshot is not None:
+            # Written once per uploaded file, not on every rerun while attached
+            stored = st.session_state.get("screenshot_upload")
+            if stored is None or stored[0] != payment_screenshot.file_id:
+                try:
+                    stored = (payment_screenshot.file_id,
+                              screenshots.store_upload(payment_screenshot, payment_screenshot.size))
+                except screenshots.UploadRejected as e:
+                    stored = None
+                    st.error(f"⚠️ {e}")
+                st.session_state.screenshot_upload = stored
+            if stored:
+                shot = stored[1]
+                file_path = shot["path"]
+                st.success("✅ Screenshot uploaded successfully!")
+                st.image(file_path, caption="Uploaded Payment Screenshot", width=300)
+
+    if st.button("Confirm Order", disabled=zone is None):
+        if not core.allow("confirm"):
+            core.busy()
+            return
+        order = {
+            "name": Name,
+            "address": address,
+            "phone": phone,
+            "pincode": pincode,
+            "payment": payment,
+            "transaction": txn if payment=="GPay" else "N/A",
+            "screenshot": file_path if file_path else "N/A",
+            "screenshot_meta": shot,
+            "items": st.session_state.cart.order_items(),
+            "gpay_number": "89407 39291" if payment=="GPay" else "N/A",
+            "order_key": st.session_state.checkout_key,
+        }
+        with perf.section("save_order"):
+            try:
+                with core.heavy():
+                    job = save_order(order)
+                order_id = job.result() if job.done() else None
+            except (Busy, queue.Full):
+                st.error("⚠️ We're taking a lot of orders right now, please try again in a moment.")
+                return
+            except (OutOfStock, RuntimeError) as e:
+                st.error(save_error(e, order["items"]))
+                return
+        placed = {"id": order_id, "total": st.session_state.cart.total}
+        if order_id is None:
+            # Still queued: order_pending resolves it before anything is confirmed
+            placed.update(job=job, items=order["items"])
+        else:
+            core.get_receipts().submit(order_id)
+        st.session_state.placed_order = placed
+        st.session_state.cart.clear()
+        st.session_state.pop("checkout_key", None)
+        st.session_state.pop("screenshot_upload", None)
+        st.rerun()
+
+
+def save_error(e, items):
+    """What to tell the shopper when the writer turned their order down."""
+    if isinstance(e, OutOfStock):
+        names = ", ".join(line["name"] for line in items if line["id"] in e.product_ids)
+        return f"⚠️ Sorry, not enough stock left for: {names}. Please update your cart."
+    return "⚠️ Your order could not be saved, please try again."
+
+
+@st.fragment(run_every=1)
+def order_pending(placed):
+    # Polls only until the writer has committed or turned down the order
+    job = placed["job"]
+    if job.done():
+        if job.exception() is None:
+            placed["id"] = job.result()
+            core.get_receipts().submit(placed["id"])
+        else:
+            placed["error"] = save_error(job.exception(), placed["items"])
+            for line in placed["items"]:  # the cart was cleared when the order was queued
+                st.session_state.cart.add(line, line["qty"])
+        del placed["job"]
+        st.rerun()
+    st.info("⏳ Saving your order, this can take a few seconds...")
+
+
+def order_confirmation(placed, success_anim):
+    if "job" in placed:
+        order_pending(placed)
+        return
+    if "error" in placed:
+        st.error(placed["error"])
+    else:
+        if success_anim:
+            st_lottie(success_anim, height=200)
+        else:
+            st.balloons()
+        st.success(f"✅ Order #{placed['id']} placed successfully!")
+        st.write(f"Total: ₹{placed['total']}")
+        receipt_download(placed["id"])
+    st.info("🌱 Quote: 'Agriculture is the backbone of our nation.'")
+    if st.button("Continue Shopping"):
+        del st.session_state.placed_order
+        core.go("store")
+
+
+@st.fragment(run_every=1)
+def receipt_pending(order_id):
+    # Polls the disk only while this placeholder is on screen
+    if core.get_receipts().ready(order_id):
+        st.rerun()
+    st.caption("🧾 Preparing your receipt...")
+
+
+def receipt_download(order_id):
+    receipts = core.get_receipts()
+    if not receipts.ready(order_id):
+        # Also re-queues a receipt that was still pending when the app restarted
+        job = receipts.submit(order_id)
+        if job.done() and job.exception():
+            st.caption("🧾 Receipt unavailable right now.")
+        else:
+            receipt_pending(order_id)
+        return
+    with open(receipts.path(order_id), "rb") as f:
+        st.download_button("⬇ Download receipt (PDF)", data=f, file_name=f"receipt-{order_id}.pdf",
+                           mime="application/pdf")